@@ -0,0 +1,136 @@
+import numpy as np
+
+from StrategyFinder import solve_zero_sum_game
+
+
+def _pure(A: np.ndarray, tol: float):
+    """
+    Saddle points: the maximin row is optimal when its worst case equals
+    the best case of the minimax column.
+    """
+    row_min = A.min(axis=2)
+    col_max = A.max(axis=1)
+    lower = row_min.max(axis=1)
+    upper = col_max.min(axis=1)
+    return upper - lower <= tol, row_min.argmax(axis=1), col_max.argmin(axis=1), lower
+
+
+def _solve_2x2(A: np.ndarray):
+    """
+    Closed form of 2x2 games without a saddle point, which are completely
+    mixed: with A = [[a, b], [c, d]] and D = a - b - c + d,
+    x1 = (d - c) / D, y1 = (d - b) / D and v = (ad - bc) / D.
+    """
+    a, b, c, d = A[:, 0, 0], A[:, 0, 1], A[:, 1, 0], A[:, 1, 1]
+    den = a - b - c + d
+    x1 = (d - c) / den
+    y1 = (d - b) / den
+    return np.stack((x1, 1 - x1), axis=1), np.stack((y1, 1 - y1), axis=1), (a * d - b * c) / den
+
+
+def _simplex(A: np.ndarray, tol: float, max_iter: int):
+    """
+    Runs the simplex method on every game of the stack in lockstep. Each
+    game is shifted to positive payoffs P, so Player B's LP becomes
+    max 1^T w s.t. P w <= 1, w >= 0, whose slack basis is feasible from
+    the start. Then y = w / sum(w), v = 1 / sum(w) plus the shift, and
+    Player A's strategy is read from the reduced costs of the slacks.
+    Bland's rule keeps degenerate games from cycling.
+
+    Games still pivoting after max_iter are returned as they are and left
+    to the caller's equilibrium check.
+    """
+    G, m, n = A.shape
+    shift = A.min(axis=(1, 2)) - 1
+    T = np.zeros((G, m + 1, n + m + 1))
+    T[:, :m, :n] = A - shift[:, None, None]
+    T[:, :m, n:n + m] = np.eye(m)
+    T[:, :m, -1] = 1
+    T[:, m, :n] = -1
+    basis = np.tile(np.arange(n, n + m), (G, 1))
+
+    active = np.arange(G)
+    for _ in range(max_iter):
+        S = T[active]
+        negative = S[:, m, :-1] < -tol
+        pivoting = negative.any(axis=1)
+        active, S, negative = active[pivoting], S[pivoting], negative[pivoting]
+        if not len(active):
+            break
+
+        # Bland: the first improving column enters, ties in the ratio test
+        # go to the row whose basic variable has the lowest index
+        rows = np.arange(len(active))
+        entering = negative.argmax(axis=1)
+        column = S[rows, :m, entering]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            ratios = np.where(column > tol, S[:, :m, -1] / column, np.inf)
+        ties = ratios <= ratios.min(axis=1, keepdims=True) + tol
+        leaving = np.where(ties, basis[active], n + m).argmin(axis=1)
+
+        pivot_row = S[rows, leaving] / S[rows, leaving, entering][:, None]
+        S -= S[rows, :, entering][:, :, None] * pivot_row[:, None, :]
+        S[rows, leaving] = pivot_row
+        T[active] = S
+        basis[active, leaving] = entering
+
+    total = T[:, m, -1]
+    w = np.zeros((G, n + m))
+    np.put_along_axis(w, basis, T[:, :m, -1], axis=1)
+    y = w[:, :n] / total[:, None]
+    x = T[:, m, n:n + m] / total[:, None]
+    return x, y, 1 / total + shift
+
+
+def solve_batch(matrices, tol: float = 1e-9, max_iter: int | None = None) -> dict:
+    """
+    Solves a stack of small zero-sum games in one NumPy pass instead of one
+    linprog call each. Saddle points and 2x2 games are solved in closed
+    form, every other game by a simplex run vectorized over the stack.
+    Only games that fail the final equilibrium check fall back to
+    solve_zero_sum_game.
+
+    Args:
+        matrices : (B, m, n) stack of payoff matrices from Player A's
+            perspective.
+        tol : Tolerance of the pivoting and of the equilibrium check.
+        max_iter : Simplex pivots before giving up on a game, by default
+            10 * (m + n).
+
+    Returns:
+        dict: (B, m) Hider strategies, (B, n) Seeker strategies, (B,) game
+        values, and a (B,) bool mask "LP" of the games that needed the LP.
+    """
+    A = np.asarray(matrices, dtype=float)
+    B, m, n = A.shape
+    if max_iter is None:
+        max_iter = 10 * (m + n)
+    x = np.zeros((B, m))
+    y = np.zeros((B, n))
+    value = np.zeros(B)
+
+    pure, row, col, pure_value = _pure(A, tol)
+    x[pure, row[pure]] = 1
+    y[pure, col[pure]] = 1
+    value[pure] = pure_value[pure]
+
+    mixed = np.flatnonzero(~pure)
+    if (m, n) == (2, 2):
+        x[mixed], y[mixed], value[mixed] = _solve_2x2(A[mixed])
+    elif len(mixed):
+        x[mixed], y[mixed], value[mixed] = _simplex(A[mixed], tol, max_iter)
+
+    # neither player may gain by deviating, whatever produced the strategies
+    scale = 1 + np.abs(A).max(axis=(1, 2))
+    exploitability = np.einsum("bij,bj->bi", A, y).max(axis=1) - np.einsum("bi,bij->bj", x, A).min(axis=1)
+    used_lp = ~(np.isfinite(exploitability) & (exploitability <= 1e3 * tol * scale))
+    for g in np.flatnonzero(used_lp):
+        result = solve_zero_sum_game(A[g])
+        x[g], y[g], value[g] = result['Hider'], result['Seeker'], result['Game value (v)']
+
+    return {
+        'Hider': x,
+        'Seeker': y,
+        'Game value (v)': value,
+        'LP': used_lp
+    }
@@ -0,0 +1,252 @@
+import argparse
+import json
+import random
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+from GameInterface import GameInterface
+from PayoffMatrix import SPARSE_THRESHOLD, PayoffMatrix, build_matrix, build_structured
+from StrategyFinder import solve_zero_sum_game
+
+BASELINE = "benchmark_baseline.json"
+
+# worlds the build and solve benchmarks run on, 1D and 2D
+WORLDS = [(1, 16), (1, 256), (1, 1024), (4, 4), (16, 16), (32, 32), (48, 48)]
+# rounds the simulate benchmark plays
+ROUNDS = [10**3, 10**4, 10**5, 10**6, 10**7]
+
+
+def build_matrix_loop(location_type, n: int, m: int) -> list:
+    """
+    the original PayoffMatrix.initialize builder, nested python loops and
+    all, kept as the reference build_matrix is benchmarked against
+
+    :param location_type: type (1, 2 or 3) of every location, row-major
+    :param n: number of rows
+    :param m: number of columns
+    :return: (n*m) x (n*m) payoff matrix as a list of lists
+    """
+    size = n * m
+
+    def to2d(ind: int) -> tuple:
+        return ind // m, ind % m
+
+    def to1d(i: int, j: int) -> int:
+        return (i) * m + j
+
+    matrix = [[0 for _ in range(size)] for _ in range(size)]
+
+    for i in range(size):
+        for j in range(size):
+            ri, ci = to2d(i)
+            rj, cj = to2d(j)
+            matrix[i][j] = 1
+
+            if location_type[i] == 2:
+                matrix[i][j] = 2
+
+            if i == j :
+                matrix[i][j] = -1
+                if location_type[i] == 3:
+                    matrix[i][j] = -3
+
+    for i in range(size):
+        row, col = to2d(i)
+        done = [[False for _ in range(size)] for _ in range(size)]
+
+        dx = [0,0,-1,1]
+        dy = [1,-1,0,0]
+
+        for j in range(len(dx)):
+            if 0 <= row + dx[j] < n and 0 <= col + dy[j] < m and done[i][to1d(row+dx[j],col+dy[j])] == False:
+                done[i][to1d(row+dx[j],col+dy[j])] = True
+                matrix[i][to1d(row+dx[j],col+dy[j])] *=0.5
+        dx = [0, 0, -2, 2]
+        dy = [2, -2, 0, 0]
+
+        for j in range(len(dx)):
+            if 0 <= row + dx[j] < n and 0 <= col + dy[j] < m and done[i][to1d(row + dx[j], col + dy[j])] == False:
+                done[i][to1d(row + dx[j], col + dy[j])] = True
+                matrix[i][to1d(row + dx[j], col + dy[j])] *= 0.75
+
+    return matrix
+
+
+def time_call(func, *args, repeat: int = 3) -> float:
+    """
+    best wall-clock time of `repeat` calls of func(*args), in seconds
+    """
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(*args)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def benchmark_construction(worlds, loop_limit: int = 400) -> list[dict]:
+    """
+    compare the loop and the vectorized payoff matrix builders, checking
+    that both give the same matrix
+
+    :param worlds: iterable of (n, m) world sizes
+    :param loop_limit: largest world size (n*m) the loop builder is run on
+    :return: one result dict per world
+    """
+    results = []
+    for n, m in worlds:
+        location_type = [random.randint(1, 3) for _ in range(n * m)]
+        vectorized = time_call(build_matrix, location_type, n, m)
+        loop = None
+        if n * m <= loop_limit:
+            assert np.array_equal(build_matrix(location_type, n, m),
+                                  np.asarray(build_matrix_loop(location_type, n, m))), (n, m)
+            loop = time_call(build_matrix_loop, location_type, n, m, repeat=1)
+        results.append({"n": n, "m": m, "loop": loop, "vectorized": vectorized})
+    return results
+
+
+def measure(func, *args, repeat: int = 3) -> dict:
+    """
+    best wall-clock time of `repeat` calls of func(*args), and the peak
+    memory allocated during one more call traced by tracemalloc, which is
+    kept apart so the tracing overhead doesn't skew the time
+
+    :return: dict with "time" in seconds and "peak" in bytes
+    """
+    best = time_call(func, *args, repeat=repeat)
+    tracemalloc.start()
+    try:
+        func(*args)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return {"time": best, "peak": peak}
+
+
+def builder(n: int, m: int):
+    """
+    the builder PayoffMatrix.initialize picks for an n x m world
+    """
+    return build_structured if n * m > SPARSE_THRESHOLD else build_matrix
+
+
+def suite(worlds=WORLDS, rounds=ROUNDS, seed: int = 0):
+    """
+    the benchmark cases: building the payoff matrix, solving it, and
+    simulating games
+
+    :return: generator of (name, setup, func) tuples, func is timed on
+        the arguments setup returns
+    """
+    for n, m in worlds:
+        types = np.random.default_rng(seed).integers(1, 4, n * m)
+        yield f"build/{n}x{m}", lambda n=n, m=m, types=types: (types, n, m), builder(n, m)
+    for n, m in worlds:
+        types = np.random.default_rng(seed).integers(1, 4, n * m)
+        yield f"solve/{n}x{m}", lambda n=n, m=m, types=types: (builder(n, m)(types, n, m),), solve_zero_sum_game
+    for count in rounds:
+        def setup(count=count):
+            payoff = PayoffMatrix(4, 4, rng=np.random.default_rng(seed), cache=None)
+            return GameInterface(payoff, 0), count, np.random.default_rng(seed)
+        yield f"simulate/{count}", setup, lambda interface, count, rng: interface.simulate(count, rng)
+
+
+def run_suite(cases, repeat: int = 3) -> dict:
+    """
+    :param cases: (name, setup, func) tuples, e.g. from suite()
+    :return: measure() result per case name
+    """
+    results = {}
+    for name, setup, func in cases:
+        args = setup()
+        results[name] = measure(func, *args, repeat=repeat)
+    return results
+
+
+def compare(results: dict, baseline: dict, time_tolerance: float = 0.25,
+            memory_tolerance: float = 0.10, min_time: float = 1e-3) -> list[str]:
+    """
+    regressions of results against baseline; cases missing from either
+    side are skipped
+
+    :param time_tolerance: allowed relative slowdown
+    :param memory_tolerance: allowed relative growth of the peak memory
+    :param min_time: slowdowns smaller than this many seconds are noise
+    :return: one message per regression
+    """
+    regressions = []
+    for name, result in results.items():
+        if name not in baseline:
+            continue
+        old = baseline[name]
+        if result["time"] > old["time"] * (1 + time_tolerance) and result["time"] - old["time"] > min_time:
+            regressions.append(f"{name}: time {old['time']:.4g}s -> {result['time']:.4g}s")
+        if result["peak"] > old["peak"] * (1 + memory_tolerance):
+            regressions.append(f"{name}: peak memory {old['peak']} -> {result['peak']} bytes")
+    return regressions
+
+
+def load_baseline(path: str = BASELINE) -> dict:
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+
+
+def save_baseline(results: dict, path: str = BASELINE) -> None:
+    with open(path, "w") as f:
+        json.dump(results, f, indent=2, sort_keys=True)
+        f.write("\n")
+
+
+def print_construction(worlds) -> None:
+    print(f"{'world':>10} {'size':>6} {'loop (s)':>10} {'vectorized (s)':>15} {'speedup':>9}")
+    for r in benchmark_construction(worlds):
+        world = f"{r['n']}x{r['m']}"
+        if r["loop"] is None:
+            print(f"{world:>10} {r['n'] * r['m']:>6} {'-':>10} {r['vectorized']:>15.6f} {'-':>9}")
+        else:
+            speedup = r["loop"] / r["vectorized"]
+            print(f"{world:>10} {r['n'] * r['m']:>6} {r['loop']:>10.4f} {r['vectorized']:>15.6f} {speedup:>8.1f}x")
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark building, solving and simulating games.")
+    parser.add_argument("--baseline", default=BASELINE, help="baseline JSON file to compare against")
+    parser.add_argument("--update-baseline", action="store_true", help="write the results as the new baseline")
+    parser.add_argument("--quick", action="store_true", help="skip the largest worlds and simulations")
+    parser.add_argument("--construction", action="store_true",
+                        help="only compare the loop and vectorized matrix builders")
+    args = parser.parse_args(argv)
+
+    if args.construction:
+        print_construction([(1, 8), (1, 64), (5, 5), (10, 10), (15, 15), (20, 20), (30, 30), (40, 40), (60, 60)])
+        return 0
+
+    worlds, rounds = (WORLDS[:-1], ROUNDS[:-1]) if args.quick else (WORLDS, ROUNDS)
+    baseline = load_baseline(args.baseline)
+    results = run_suite(suite(worlds, rounds))
+
+    print(f"{'case':>17} {'time (s)':>11} {'peak (MiB)':>11} {'baseline (s)':>13}")
+    for name, r in results.items():
+        old = f"{baseline[name]['time']:.4g}" if name in baseline else "-"
+        print(f"{name:>17} {r['time']:>11.4g} {r['peak'] / 2**20:>11.2f} {old:>13}")
+
+    if args.update_baseline:
+        save_baseline({**baseline, **results}, args.baseline)
+        print(f"baseline written to {args.baseline}")
+        return 0
+
+    regressions = compare(results, baseline)
+    for message in regressions:
+        print("REGRESSION", message)
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,16 +1,32 @@
 import numpy as np
 
-from PayoffMatrix import PayoffMatrix
+from Instrumentation import count, span
+from Opponents import make_opponent
+from PayoffMatrix import PayoffMatrix, build_structured
+from StructuredPayoff import StructuredPayoff
 
 
 class GameInterface:
-    def __init__(self, payoff_matrix: PayoffMatrix, perspective: int):
+    def __init__(self, payoff_matrix: PayoffMatrix, perspective: int, opponent: str = "equilibrium",
+                 rng: np.random.Generator | None = None, **options):
         """
         :param payoff_matrix (PayoffMatrix): the game matrix object
         :param perspective: 0 if player chose to hide, 1 if player chose to seek
+        :param opponent: how the computer picks its moves, "equilibrium"
+            samples the optimal strategy, "frequency", "exp3" and "markov"
+            learn from the player's choices
+        :param rng: random generator the computer samples with
+        :param options: passed on to the opponent, e.g. gamma or window
         """
         self.payoff_matrix = payoff_matrix
         self.perspective = perspective
+        matrix = payoff_matrix.matrix
+        if opponent != "equilibrium" and not isinstance(matrix, StructuredPayoff):
+            # the adaptive opponents update through the sparse structure,
+            # the equilibrium one only samples its strategy
+            matrix = build_structured(payoff_matrix.location_type, payoff_matrix.n, payoff_matrix.m)
+        strategy = payoff_matrix.probability['Seeker' if perspective == 0 else 'Hider']
+        self.opponent = make_opponent(opponent, matrix, strategy, perspective == 1, rng, **options)
         self.player_score =0
         self.computer_score = 0
         self.score = 0
@@ -24,80 +40,94 @@ class GameInterface:
         :return:
         """
 
-        choices = []
         self.player_choices.append(place)
-        for i in range(self.payoff_matrix.size):
-            choices.append(i)
-        if self.perspective == 0:
-            values = self.payoff_matrix.probability['Seeker']
-        else:
-            values = self.payoff_matrix.probability['Hider']
-
-        print(values)
-
-        x = np.random.choice(choices, 1, p=values)[0]
+        x = self.opponent.choose()
+        self.opponent.observe(place, x)
         self.computer_choices.append(x)
-        print(x)
         if self.perspective == 0:
-            self.score += self.payoff_matrix.matrix[place][x]
+            self.score += self.payoff_matrix.matrix[place, x]
             if x == place:
-                self.computer_score -= self.payoff_matrix.matrix[place][x]
-                self.player_score += self.payoff_matrix.matrix[place][x]
+                self.computer_score -= self.payoff_matrix.matrix[place, x]
+                self.player_score += self.payoff_matrix.matrix[place, x]
             else:
-                self.player_score += self.payoff_matrix.matrix[place][x]
-                self.computer_score -= self.payoff_matrix.matrix[place][x]
+                self.player_score += self.payoff_matrix.matrix[place, x]
+                self.computer_score -= self.payoff_matrix.matrix[place, x]
 
         else:
-            self.score += self.payoff_matrix.matrix[x][place]
+            self.score += self.payoff_matrix.matrix[x, place]
             if x == place:
-                self.computer_score += self.payoff_matrix.matrix[x][place]
-                self.player_score -= self.payoff_matrix.matrix[x][place]
+                self.computer_score += self.payoff_matrix.matrix[x, place]
+                self.player_score -= self.payoff_matrix.matrix[x, place]
             else:
-                self.player_score -= self.payoff_matrix.matrix[x][place]
-                self.computer_score += self.payoff_matrix.matrix[x][place]
+                self.player_score -= self.payoff_matrix.matrix[x, place]
+                self.computer_score += self.payoff_matrix.matrix[x, place]
+
 
+    def simulate(self, number_of_games: int, rng: np.random.Generator | None = None):
+        """
+        play number_of_games rounds of the computer against itself, both
+        sides sampling from the equilibrium strategies
 
-    def simulate(self,number_of_games):
-        choices = []
-        for i in range(self.payoff_matrix.size):
-            choices.append(i)
+        :param number_of_games: number of rounds to simulate
+        :param rng: random generator to sample with, a fresh one if None
+        :return: cumulative seeker scores, cumulative hider scores,
+            seeker choices and hider choices, all as arrays
+        """
+        chunks = list(self.simulate_stream(number_of_games, max(number_of_games, 1), rng))
+        if not chunks:
+            return np.zeros(0), np.zeros(0), np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+        return chunks[0]
 
+    def simulate_stream(self, number_of_games: int, chunk_size: int = 100000,
+                        rng: np.random.Generator | None = None):
+        """
+        same as simulate, but yields the rounds chunk by chunk so memory is
+        bounded by chunk_size however many rounds are played; the scores
+        carry on from one chunk to the next
+
+        :param number_of_games: number of rounds to simulate
+        :param chunk_size: rounds per chunk
+        :param rng: random generator to sample with, a fresh one if None
+        :return: generator of (seeker scores, hider scores, seeker choices,
+            hider choices) chunks
+        """
+        if rng is None:
+            rng = np.random.default_rng()
+        size = self.payoff_matrix.size
         seeker_values = self.payoff_matrix.probability['Seeker']
         hider_values = self.payoff_matrix.probability['Hider']
-
-        seeker_choices = np.random.choice(choices, number_of_games, p=seeker_values)
-        hider_choices = np.random.choice(choices, number_of_games, p=hider_values)
-        seeker_score = [0]
-        hider_score = [0]
-        if seeker_choices[0] == hider_choices[0]:
-            seeker_score[0] =(self.payoff_matrix.matrix[seeker_choices[0]][hider_choices[0]])*-1
-        else:
-            hider_score[0] = (self.payoff_matrix.matrix[hider_choices[0]][seeker_choices[0]])
-
-        for i in range(1,number_of_games):
-            if hider_choices[i] != seeker_choices[i]:
-                hider_score.append(hider_score[i-1] + (self.payoff_matrix.matrix[hider_choices[i]][seeker_choices[i]]))
-                seeker_score.append(seeker_score[i-1])
-            else:
-                seeker_score.append(seeker_score[i-1] + (self.payoff_matrix.matrix[hider_choices[i]][seeker_choices[i]])*-1)
-                hider_score.append(hider_score[i-1])
-
-        return seeker_score, hider_score, seeker_choices, hider_choices
-
-
-mat = PayoffMatrix(2,2)
-ss,hs,_,q = GameInterface(mat, 0).simulate(10)
-for i in range(mat.size):
-    print(mat.matrix[i])
-result = mat.probability
-
-print("Optimal strategy for Player A (x):", np.round(result['Hider'], 4))
-print("Optimal strategy for Player B (y):", np.round(result['Seeker'], 4))
-print("Game value (v):", np.round(result['Game value (v)'], 4))
-print()
-print("seeker choices: ",_)
-print("hider choices: ",q)
-print(ss)
-print(hs)
-
-
+        seeker_total = 0.0
+        hider_total = 0.0
+
+        for start in range(0, number_of_games, chunk_size):
+            rounds = min(chunk_size, number_of_games - start)
+            with span("simulate chunk", rounds=rounds, size=size):
+                seeker_choices = rng.choice(size, rounds, p=seeker_values)
+                hider_choices = rng.choice(size, rounds, p=hider_values)
+
+                # the hider scores A[h][s] when it isn't found, the seeker -A[h][s] when it finds the hider
+                payoffs = self.payoff_matrix.matrix[hider_choices, seeker_choices]
+                found = hider_choices == seeker_choices
+                hider_score = hider_total + np.cumsum(np.where(found, 0.0, payoffs))
+                seeker_score = seeker_total + np.cumsum(np.where(found, -payoffs, 0.0))
+                hider_total, seeker_total = hider_score[-1], seeker_score[-1]
+            count("simulate.rounds", rounds)
+
+            yield seeker_score, hider_score, seeker_choices, hider_choices
+
+
+if __name__ == "__main__":
+    mat = PayoffMatrix(2,2)
+    ss,hs,_,q = GameInterface(mat, 0).simulate(10)
+    for i in range(mat.size):
+        print(mat.matrix[i])
+    result = mat.probability
+
+    print("Optimal strategy for Player A (x):", np.round(result['Hider'], 4))
+    print("Optimal strategy for Player B (y):", np.round(result['Seeker'], 4))
+    print("Game value (v):", np.round(result['Game value (v)'], 4))
+    print()
+    print("seeker choices: ",_)
+    print("hider choices: ",q)
+    print(ss)
+    print(hs)
@@ -1,16 +1,30 @@
+import argparse
+import os
 import sys
+import numpy as np
+from PyQt6.QtCore import QThreadPool, QTimer
 from PyQt6.QtWidgets import (
-    QApplication, QMainWindow, QTableWidgetItem, QMessageBox, QButtonGroup, QPushButton
+    QApplication, QMainWindow, QMessageBox, QButtonGroup, QPushButton, QProgressBar, QHeaderView
 )
 from PyQt6 import uic
-from PayoffMatrix import PayoffMatrix
 from GameInterface import GameInterface
+from GuiWorkers import SolveWorker
+from Instrumentation import PROFILE_ENV, profiled, span, trace_to
+from TableModels import ChoicesTableModel, PayoffTableModel, ProbabilityTableModel
+
+# rounds simulated per timer tick, and chart points taken from each chunk
+SIM_CHUNK = 50000
+SIM_POINTS_PER_CHUNK = 16
 
 
 class MainWindow(QMainWindow):
-    def __init__(self):
+    def __init__(self, profile_path: str | None = None):
         super().__init__()
-        uic.loadUi("Gui.ui", self)  
+        uic.loadUi(os.path.join(os.path.dirname(os.path.abspath(__file__)), "Gui.ui"), self)
+        # cProfile every start-game cycle into this file
+        self.profile_path = profile_path or os.environ.get(PROFILE_ENV)
+        self.solve_job = 0
+        self.thread_pool = QThreadPool.globalInstance()
         self.setWindowTitle("Hide and Seek Game Theory")
         self.setGeometry(100, 100, 1000, 700)
         self.init_ui()
@@ -18,12 +32,45 @@ class MainWindow(QMainWindow):
         
         
     def init_ui(self):
+        self.matrix_model = PayoffTableModel(parent=self)
+        self.prob_model = ProbabilityTableModel(parent=self)
+        self.choices_model = ChoicesTableModel(parent=self)
+        self.matrix_table.setModel(self.matrix_model)
+        self.prob_table.setModel(self.prob_model)
+        self.choices.setModel(self.choices_model)
+        # fixed section sizes so the views never measure every row of a large world
+        for view in (self.matrix_table, self.prob_table, self.choices):
+            view.verticalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Fixed)
+            view.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Fixed)
+        self.matrix_table.horizontalHeader().setDefaultSectionSize(56)
+        self.prob_table.horizontalHeader().setDefaultSectionSize(64)
+
         self.start_btn.clicked.connect(self.start_game)
         self.reset_btn.clicked.connect(self.reset_game)
         self.sim_btn.clicked.connect(self.simulate_game)
         self.oneD.clicked.connect(self.update_world_type)
         self.twoD.clicked.connect(self.update_world_type)
         self.next_round_btn.clicked.connect(self.prepare_next_round)
+        self.place_table.place_clicked.connect(self.place_selected)
+
+        # busy indicator and cancel button shown while a world is being solved
+        self.solve_progress = QProgressBar()
+        self.solve_progress.setRange(0, 0)
+        self.solve_progress.setMaximumWidth(200)
+        self.cancel_btn = QPushButton("Cancel")
+        self.cancel_btn.clicked.connect(self.cancel_solve)
+        self.statusbar.addPermanentWidget(self.solve_progress)
+        self.statusbar.addPermanentWidget(self.cancel_btn)
+        self.set_solving(False)
+
+        self.sim_rounds.setRange(1, 1_000_000_000)
+        self.sim_rounds.setSingleStep(1000)
+        self.sim_rounds.setValue(100000)
+        self.sim_rounds.setSuffix(" rounds")
+        self.sim_timer = QTimer(self)
+        self.sim_timer.setInterval(0)
+        self.sim_timer.timeout.connect(self.simulation_step)
+        self.sim_stream = None
 
         self.N.setValue(3)
         self.M.setValue(3)
@@ -43,6 +90,12 @@ class MainWindow(QMainWindow):
         self.update_world_type()
 
     def reset_game(self):
+        # results of a solve still in flight are dropped when they arrive
+        self.solve_job += 1
+        self.set_solving(False)
+        self.stop_simulation()
+        self.score_chart.clear()
+        self.freq_chart.set_equilibrium([], [])
         self.payoff = None
         self.interface = None
         self.rounds = 0
@@ -50,8 +103,9 @@ class MainWindow(QMainWindow):
         self.computer_score = 0
         self.update_scoreboard()
         self.info_label.setText("Set world size and role, then click Start Game.")
-        self.matrix_table.clear()
-        self.prob_table.clear()
+        self.matrix_model.set_matrix(None)
+        self.prob_model.set_probability(None)
+        self.choices_model.clear()
         self.place_table.clear()
         self.N.setValue(3)
         self.M.setValue(3)
@@ -60,15 +114,53 @@ class MainWindow(QMainWindow):
     def start_game(self):
         n = self.N.value()
         m = self.M.value()
-        role = 0 if self.hider_radio.isChecked() else 1
+        if not self.twoD.isChecked():
+            n, m = 1, n
+        self.pending_role = 0 if self.hider_radio.isChecked() else 1
+
+        # a new start supersedes any solve still running
+        self.solve_job += 1
+        worker = SolveWorker(self.solve_job, n, m)
+        worker.signals.finished.connect(self.solve_finished)
+        worker.signals.failed.connect(self.solve_failed)
+        self.set_solving(True)
+        self.info_label.setText(f"Solving a {n}x{m} world...")
+        if self.profile_path:
+            # cProfile only sees its own thread, so solve on this one and
+            # let the signals fill the tables inside the same profile
+            with profiled(self.profile_path):
+                worker.run()
+            return
+        self.thread_pool.start(worker)
+
+    def set_solving(self, solving):
+        self.solve_progress.setVisible(solving)
+        self.cancel_btn.setVisible(solving)
+
+    def cancel_solve(self):
+        self.solve_job += 1
+        self.set_solving(False)
+        self.info_label.setText("Solve cancelled. Set world size and role, then click Start Game.")
+
+    def solve_failed(self, job, message):
+        if job != self.solve_job:
+            return
+        self.set_solving(False)
+        QMessageBox.warning(self, "Error", f"Could not solve the world: {message}")
+
+    def solve_finished(self, job, payoff):
+        if job != self.solve_job:
+            return
+        self.set_solving(False)
+        self.stop_simulation()
+        role = self.pending_role
 
-        self.payoff = PayoffMatrix(n, m) if self.twoD.isChecked() else PayoffMatrix(1, n)
+        self.payoff = payoff
         self.interface = GameInterface(self.payoff, role)
         self.rounds = 0
         self.player_score = 0
         self.computer_score = 0
-        self.choices.setColumnCount(2)
-        self.choices.setHorizontalHeaderLabels(["Hider", "Seeker"])
+        self.choices_model.clear()
         self.update_tables()
         self.update_scoreboard()
         self.info_label.setText(f"Game started! You are the {'Hider' if role==0 else 'Seeker'}.")
@@ -76,50 +168,17 @@ class MainWindow(QMainWindow):
         self.next_round_btn.setEnabled(False)
 
     def update_tables(self):
-        n = self.payoff.n
-        m = self.payoff.m
-        size = n * m
-       
-        self.matrix_table.clear()
-        self.matrix_table.setRowCount(size)
-        self.matrix_table.setColumnCount(size)
-        for i in range(size):
-            for j in range(size):
-                self.matrix_table.setItem(i, j, QTableWidgetItem(str(self.payoff.matrix[i][j])))
-        self.matrix_table.setHorizontalHeaderLabels([str(i) for i in range(size)])
-        self.matrix_table.setVerticalHeaderLabels([str(i) for i in range(size)])
-
-   
-        self.prob_table.clear()
-        self.prob_table.setRowCount(2)
-        self.prob_table.setColumnCount(size)
-        probs = self.payoff.probability
-        for i in range(size):
-            self.prob_table.setItem(0, i, QTableWidgetItem(f"{probs['Hider'][i]:.4f}"))
-            self.prob_table.setItem(1, i, QTableWidgetItem(f"{probs['Seeker'][i]:.4f}"))
-        self.prob_table.setVerticalHeaderLabels(["Hider", "Seeker"])
-        self.prob_table.setHorizontalHeaderLabels([str(i) for i in range(size)])
+        with span("MainWindow.update_tables", size=self.payoff.size):
+            # The models only format the cells the views actually show
+            self.matrix_model.set_matrix(self.payoff.matrix)
+            self.prob_model.set_probability(self.payoff.probability)
 
-        # Place table for selection
-        self.prepare_place_table()
+            # Place table for selection
+            self.prepare_place_table()
 
     def prepare_place_table(self):
-        n = self.payoff.n
-        m = self.payoff.m
-        self.place_table.clear()
-        self.place_table.setRowCount(n)
-        self.place_table.setColumnCount(m)
-        self.button_refs = {}  # Store buttons for color reset
-        for i in range(n):
-            for j in range(m):
-                idx = i * m + j
-                btn = QPushButton(f"{idx}")
-                self.set_button_color(btn, self.payoff.location_type[idx])
-                btn.clicked.connect(lambda _, idx=idx: self.place_selected(idx))
-                self.place_table.setCellWidget(i, j, btn)
-                self.button_refs[idx] = btn
-        self.place_table.setHorizontalHeaderLabels([str(j) for j in range(m)])
-        self.place_table.setVerticalHeaderLabels([str(i) for i in range(n)])
+        self.place_table.set_world(self.payoff.n, self.payoff.m, self.payoff.location_type)
+        self.place_table.setEnabled(True)
 
     def place_selected(self, idx):
         if not self.interface:
@@ -132,55 +191,27 @@ class MainWindow(QMainWindow):
         self.computer_score = self.interface.computer_score
         player_choice = self.interface.player_choices[-1]
         computer_choice = self.interface.computer_choices[-1]
-
-        player_choice = self.interface.player_choices[-1]
-        computer_choice = self.interface.computer_choices[-1]
-        row = self.choices.rowCount()
-        self.choices.insertRow(row)
-        self.choices.setItem(row, 0, QTableWidgetItem(str(player_choice)))
-        self.choices.setItem(row, 1, QTableWidgetItem(str(computer_choice)))
+        self.add_choices(player_choice, computer_choice)
         self.info_label.setText(
             f"Your selection: {player_choice} | Computer selection: {computer_choice}"
         )
         self.update_scoreboard()
-        # Disable all buttons until next round
-        for btn in self.button_refs.values():
-            btn.setEnabled(False)
+        # Ignore clicks until next round
+        self.place_table.setEnabled(False)
         # Highlight choices
         self.highlight_choices(player_choice, computer_choice)
         self.next_round_btn.setEnabled(True)
 
     def prepare_next_round(self):
-        # Reset all buttons to their original color and enable
-        self.reset_button_colors()
-        for btn in self.button_refs.values():
-            btn.setEnabled(True)
+        # Reset the highlighted places and accept clicks again
+        self.place_table.clear_highlight()
+        self.place_table.setEnabled(True)
         self.info_label.setText("Choose your place for the next round.")
         self.next_round_btn.setEnabled(False)
-        
-    def set_button_color(self, btn, type_value):
-        # Set color based on type
-        if type_value == 1:
-            btn.setStyleSheet("background-color: blue; color: white;")
-        elif type_value == 2:
-            btn.setStyleSheet("background-color: green; color: white;")
-        elif type_value == 3:
-            btn.setStyleSheet("background-color: red; color: white;")
-        else:
-            btn.setStyleSheet("")
 
     def highlight_choices(self, player_idx, computer_idx):
         # Mark both yellow if different, black if same
-        if player_idx == computer_idx:
-            self.button_refs[player_idx].setStyleSheet("background-color: black; color: white;")
-        else:
-            self.button_refs[player_idx].setStyleSheet("background-color: yellow; color: black;")
-            self.button_refs[computer_idx].setStyleSheet("background-color: yellow; color: black;")
-
-    def reset_button_colors(self):
-        # Reset all buttons to their original color
-        for idx, btn in self.button_refs.items():
-            self.set_button_color(btn, self.payoff.location_type[idx])    
+        self.place_table.highlight(player_idx, computer_idx)
 
     def update_world_type(self):
         if self.oneD.isChecked():
@@ -206,43 +237,81 @@ class MainWindow(QMainWindow):
         self.player_score = self.interface.player_score
         self.computer_score = self.interface.computer_score
         self.update_scoreboard()
+        self.add_choices(self.interface.player_choices[-1], self.interface.computer_choices[-1])
 
-        self.choices.setColumnCount(2)
-        self.choices.setHorizontalHeaderLabels(["Hider", "Seeker"])        # Add choices to the choices table
-        player_choice = self.interface.player_choices[-1]
-        computer_choice = self.interface.computer_choices[-1]
-        row = self.choices.rowCount()
-        self.choices.insertRow(row)
-        self.choices.setItem(row, 0, QTableWidgetItem(str(player_choice)))
-        self.choices.setItem(row, 1, QTableWidgetItem(str(computer_choice)))
+    def add_choices(self, player_choice, computer_choice):
+        # The choices table is ordered hider, seeker whichever side the player is on
+        if self.interface.perspective == 0:
+            self.choices_model.append(player_choice, computer_choice)
+        else:
+            self.choices_model.append(computer_choice, player_choice)
+        self.choices.scrollToBottom()
 
     def simulate_game(self):
         if not self.interface:
             QMessageBox.warning(self, "Warning", "Start the game first!")
             return
-        seeker_score, hider_score, seeker_choices, hider_choices = self.interface.simulate(100)
+        if self.sim_stream is not None:
+            self.stop_simulation()
+            self.info_label.setText(f"Simulation stopped after {self.sim_done} rounds.")
+            return
+
+        # Rounds are played chunk by chunk on a timer so the window stays live
+        self.sim_total = self.sim_rounds.value()
+        self.sim_done = 0
+        self.sim_scores = (0.0, 0.0)
+        self.sim_stream = self.interface.simulate_stream(self.sim_total, SIM_CHUNK)
+        probs = self.payoff.probability
+        self.score_chart.clear()
+        self.freq_chart.set_equilibrium(probs['Hider'], probs['Seeker'])
+        self.choices_model.clear()
+        self.sim_btn.setText("Stop")
+        self.sim_timer.start()
+
+    def simulation_step(self):
+        chunk = next(self.sim_stream, None)
+        if chunk is None:
+            self.stop_simulation()
+            seeker_score, hider_score = self.sim_scores
+            self.info_label.setText(
+                f"Simulation complete! Last seeker score: {seeker_score}, hider score: {hider_score}"
+            )
+            self.player_score = self.interface.player_score
+            self.computer_score = self.interface.computer_score
+            self.update_scoreboard()
+            return
+
+        seeker_score, hider_score, seeker_choices, hider_choices = chunk
+        samples = np.linspace(0, len(hider_score) - 1, min(SIM_POINTS_PER_CHUNK, len(hider_score))).astype(int)
+        self.score_chart.add_points(self.sim_done + samples + 1, hider_score[samples], seeker_score[samples])
+        self.freq_chart.add_choices(hider_choices, seeker_choices)
+        # Only the latest chunk is kept for the choices table
+        self.choices_model.set_choices(hider_choices, seeker_choices)
+        self.sim_done += len(hider_score)
+        self.sim_scores = (seeker_score[-1], hider_score[-1])
         self.info_label.setText(
-            f"Simulation complete! Last seeker score: {seeker_score[-1]}, hider score: {hider_score[-1]}"
+            f"Simulated {self.sim_done:,} / {self.sim_total:,} rounds | "
+            f"seeker score: {seeker_score[-1]:g}, hider score: {hider_score[-1]:g}"
         )
-        self.player_score = self.interface.player_score
-        self.computer_score = self.interface.computer_score
-        self.update_scoreboard()
 
-        # Fill the choices table with hider and seeker choices
-        self.choices.clear()
-        self.choices.setRowCount(100)
-        self.choices.setColumnCount(2)
-        self.choices.setHorizontalHeaderLabels(["Hider", "Seeker"])
-        for i in range(100):
-            self.choices.setItem(i, 0, QTableWidgetItem(str(hider_choices[i])))
-            self.choices.setItem(i, 1, QTableWidgetItem(str(seeker_choices[i])))
+    def stop_simulation(self):
+        self.sim_timer.stop()
+        self.sim_stream = None
+        self.sim_btn.setText("Simulate")
 
     def update_scoreboard(self):
         self.score_label.setText(
             f"Rounds played: {self.rounds} | Player score: {self.player_score} | Computer score: {self.computer_score}"
         )
 if __name__ == "__main__":
-    app = QApplication(sys.argv)
-    window = MainWindow()
+    parser = argparse.ArgumentParser(description="Hide and Seek game theory GUI.")
+    parser.add_argument("--profile", metavar="PATH", help="cProfile every start-game cycle into PATH")
+    parser.add_argument("--trace", metavar="PATH", help="write a Chrome trace of the session to PATH on exit")
+    args, qt_args = parser.parse_known_args()
+    if args.trace:
+        trace_to(args.trace)
+
+    app = QApplication(sys.argv[:1] + qt_args)
+    window = MainWindow(args.profile)
     window.show()
     sys.exit(app.exec())
\ No newline at end of file
@@ -0,0 +1,36 @@
+from PyQt6.QtCore import QObject, QRunnable, pyqtSignal
+
+from PayoffMatrix import PayoffMatrix
+
+
+class SolveSignals(QObject):
+    # job id, solved PayoffMatrix
+    finished = pyqtSignal(int, object)
+    # job id, error message
+    failed = pyqtSignal(int, str)
+
+
+class SolveWorker(QRunnable):
+    def __init__(self, job: int, n: int, m: int) -> None:
+        """
+        builds and solves a PayoffMatrix on a QThreadPool thread and hands
+        it back through signals, so the GUI thread never blocks on the LP
+
+        :param job: id the result is tagged with, lets the window drop
+            results of superseded or cancelled jobs
+        :param n: number of rows
+        :param m: number of columns
+        """
+        super().__init__()
+        self.job = job
+        self.n = n
+        self.m = m
+        self.signals = SolveSignals()
+
+    def run(self) -> None:
+        try:
+            payoff = PayoffMatrix(self.n, self.m)
+        except Exception as error:
+            self.signals.failed.emit(self.job, str(error))
+        else:
+            self.signals.finished.emit(self.job, payoff)
@@ -0,0 +1,134 @@
+import argparse
+import multiprocessing
+import os
+import sys
+import time
+
+import numpy as np
+
+from GameInterface import GameInterface
+from IterativeSolvers import SOLVERS as ITERATIVE_SOLVERS
+from PayoffMatrix import PayoffMatrix
+from StrategyFinder import LP_METHODS
+from StructuredPayoff import StructuredPayoff
+from Tournament import make_tasks
+
+
+def world_arrays(payoff: PayoffMatrix, seeker_score: np.ndarray, hider_score: np.ndarray,
+                 game_value: float) -> dict:
+    """
+    the arrays written for one world; structured matrices are stored as
+    their base and CSR correction rather than densified
+
+    :return: name -> array, ready for np.savez
+    """
+    arrays = {
+        "n": np.int32(payoff.n),
+        "m": np.int32(payoff.m),
+        "types": np.asarray(payoff.location_type, dtype=np.int8),
+        "hider": payoff.probability['Hider'],
+        "seeker": payoff.probability['Seeker'],
+        "game_value": np.float64(game_value),
+        "hider_score": hider_score,
+        "seeker_score": seeker_score,
+    }
+    if isinstance(payoff.matrix, StructuredPayoff):
+        correction = payoff.matrix.correction.tocsr()
+        arrays.update(base=payoff.matrix.base, correction_data=correction.data,
+                      correction_indices=correction.indices, correction_indptr=correction.indptr)
+    else:
+        arrays["matrix"] = payoff.matrix
+    return arrays
+
+
+def play(payoff: PayoffMatrix, rounds: int, rng: np.random.Generator, stride: int = 1,
+         chunk_size: int = 100000) -> tuple:
+    """
+    simulate rounds games of the computer against itself, keeping every
+    stride-th point of the score trajectories so memory stays bounded by
+    rounds / stride however long the run
+
+    :return: seeker scores, hider scores
+    """
+    seeker_parts, hider_parts = [], []
+    offset = 0
+    for seeker_score, hider_score, _, _ in GameInterface(payoff, 0).simulate_stream(rounds, chunk_size, rng):
+        # keep rounds stride, 2*stride, ... counted from the first round
+        keep = np.arange((stride - 1 - offset) % stride, len(seeker_score), stride)
+        seeker_parts.append(seeker_score[keep])
+        hider_parts.append(hider_score[keep])
+        offset += len(seeker_score)
+    if not seeker_parts:
+        return np.zeros(0), np.zeros(0)
+    return np.concatenate(seeker_parts), np.concatenate(hider_parts)
+
+
+def run_world(task: tuple, method: str = "dual", stride: int = 1, output: str = ".",
+              compress: bool = False) -> dict:
+    """
+    build, solve and simulate one world and write it to its own .npz file
+
+    :param task: (world id, n, m, rounds, seed sequence), as from make_tasks
+    :param method: solver passed on to PayoffMatrix
+    :param stride: keep every stride-th point of the score trajectories
+    :param output: directory the file is written to
+    :param compress: use np.savez_compressed
+    :return: summary of the world, including the file it was written to
+    """
+    world, n, m, rounds, seed = task
+    rng = np.random.default_rng(seed)
+
+    start = time.perf_counter()
+    payoff = PayoffMatrix(n, m, rng=rng, method=method)
+    seeker_score, hider_score = play(payoff, rounds, rng, stride)
+    elapsed = time.perf_counter() - start
+
+    game_value = payoff.probability['Game value (v)']
+    path = os.path.join(output, f"world_{world:06d}.npz")
+    save = np.savez_compressed if compress else np.savez
+    save(path, **world_arrays(payoff, seeker_score, hider_score, game_value))
+    return {"world": world, "n": n, "m": m, "game_value": game_value, "seconds": elapsed, "path": path}
+
+
+def _run(args: tuple) -> dict:
+    task, options = args
+    return run_world(task, **options)
+
+
+def _summaries(jobs: list, workers: int):
+    if workers > 1:
+        with multiprocessing.Pool(workers) as pool:
+            yield from pool.imap_unordered(_run, jobs)
+    else:
+        yield from map(_run, jobs)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Generate, solve and simulate hide and seek worlds without a display.")
+    parser.add_argument("-n", type=int, default=1, help="rows of every world, 1 for a 1D world")
+    parser.add_argument("-m", type=int, default=8, help="columns of every world")
+    parser.add_argument("--worlds", type=int, default=1)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--solver", default="dual", choices=LP_METHODS + tuple(ITERATIVE_SOLVERS))
+    parser.add_argument("--rounds", type=int, default=10000)
+    parser.add_argument("--stride", type=int, default=1, help="keep every stride-th point of the score trajectories")
+    parser.add_argument("--output", default="worlds", help="directory the .npz files are written to")
+    parser.add_argument("--compress", action="store_true")
+    parser.add_argument("--workers", type=int, default=1)
+    args = parser.parse_args(argv)
+
+    os.makedirs(args.output, exist_ok=True)
+    options = {"method": args.solver, "stride": args.stride, "output": args.output, "compress": args.compress}
+    tasks = make_tasks(args.worlds, (args.n, args.n), (args.m, args.m), args.rounds, args.seed)
+    jobs = [(task, options) for task in tasks]
+
+    # every world is written and reported as soon as it is done
+    for summary in _summaries(jobs, args.workers):
+        print(f"{summary['world']}\t{summary['game_value']:.6f}\t{summary['seconds']:.3f}s\t{summary['path']}",
+              flush=True)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
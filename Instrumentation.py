@@ -0,0 +1,214 @@
+import atexit
+import contextlib
+import json
+import os
+import threading
+import time
+import tracemalloc
+
+# set to a file name to record a trace of the whole run, written there as a
+# Chrome trace (and next to it as a JSON report) when the process exits
+TRACE_ENV = "HIDE_AND_SEEK_TRACE"
+# set to a file name to cProfile every start-game cycle of the GUI into it
+PROFILE_ENV = "HIDE_AND_SEEK_PROFILE"
+
+enabled = False
+_lock = threading.Lock()
+_start = time.perf_counter_ns()
+_spans = []
+_counters = {}
+_snapshots = []
+
+
+class _Span:
+    __slots__ = ("name", "args", "begin")
+
+    def __init__(self, name: str, args: dict) -> None:
+        self.name = name
+        self.args = args
+
+    def set(self, **args) -> None:
+        """
+        attach more arguments to the span, e.g. results only known at the end
+        """
+        self.args.update(args)
+
+    def __enter__(self):
+        self.begin = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        end = time.perf_counter_ns()
+        with _lock:
+            _spans.append((self.name, self.begin - _start, end - self.begin, threading.get_ident(), self.args))
+
+
+class _NullSpan:
+    __slots__ = ()
+
+    def set(self, **args) -> None:
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc) -> None:
+        pass
+
+
+_NULL_SPAN = _NullSpan()
+
+
+def span(name: str, **args):
+    """
+    time a block: `with span("build", n=n) as s: ...; s.set(nnz=...)`.
+    While instrumentation is disabled this returns a shared no-op span, so
+    the cost is one call and a flag check.
+
+    :param name: name the span is reported under
+    :param args: values to attach to the span
+    """
+    if not enabled:
+        return _NULL_SPAN
+    return _Span(name, args)
+
+
+def count(name: str, value: float = 1) -> None:
+    """
+    add value to the counter called name
+    """
+    if not enabled:
+        return
+    with _lock:
+        _counters[name] = _counters.get(name, 0) + value
+
+
+def snapshot(label: str) -> None:
+    """
+    record the memory traced by tracemalloc so far, if it is tracing
+    (see enable)
+    """
+    if not enabled or not tracemalloc.is_tracing():
+        return
+    current, peak = tracemalloc.get_traced_memory()
+    with _lock:
+        _snapshots.append((label, time.perf_counter_ns() - _start, current, peak))
+
+
+def enable(memory: bool = False) -> None:
+    """
+    start recording spans, counters and snapshots
+
+    :param memory: also start tracemalloc so snapshots have something to
+        report; this slows allocations down noticeably
+    """
+    global enabled
+    enabled = True
+    if memory and not tracemalloc.is_tracing():
+        tracemalloc.start()
+
+
+def disable() -> None:
+    global enabled
+    enabled = False
+    if tracemalloc.is_tracing():
+        tracemalloc.stop()
+
+
+def reset() -> None:
+    with _lock:
+        _spans.clear()
+        _counters.clear()
+        _snapshots.clear()
+
+
+def report() -> dict:
+    """
+    everything recorded so far, times in microseconds since import
+
+    :return: dict with "spans", "counters" and "snapshots"
+    """
+    with _lock:
+        return {
+            "spans": [
+                {"name": name, "start": begin / 1000, "duration": duration / 1000, "thread": thread, "args": args}
+                for name, begin, duration, thread, args in _spans
+            ],
+            "counters": dict(_counters),
+            "snapshots": [
+                {"label": label, "time": when / 1000, "current": current, "peak": peak}
+                for label, when, current, peak in _snapshots
+            ],
+        }
+
+
+def chrome_trace() -> dict:
+    """
+    everything recorded so far in the Chrome trace event format, to open
+    in chrome://tracing or Perfetto
+    """
+    data = report()
+    pid = os.getpid()
+    events = [
+        {"name": s["name"], "ph": "X", "ts": s["start"], "dur": s["duration"], "pid": pid, "tid": s["thread"],
+         "args": {key: _jsonable(value) for key, value in s["args"].items()}}
+        for s in data["spans"]
+    ]
+    events += [
+        {"name": "memory", "ph": "C", "ts": s["time"], "pid": pid, "args": {"current": s["current"], "peak": s["peak"]}}
+        for s in data["snapshots"]
+    ]
+    return {"traceEvents": events, "otherData": {"counters": data["counters"]}}
+
+
+def _jsonable(value):
+    if isinstance(value, (str, int, float, bool)) or value is None:
+        return value
+    if hasattr(value, "item") and getattr(value, "ndim", 1) == 0:
+        return value.item()
+    return str(value)
+
+
+def export_json(path: str) -> None:
+    with open(path, "w") as f:
+        json.dump(report(), f, indent=2, default=_jsonable)
+
+
+def export_chrome_trace(path: str) -> None:
+    with open(path, "w") as f:
+        json.dump(chrome_trace(), f)
+
+
+@contextlib.contextmanager
+def profiled(path: str):
+    """
+    cProfile the block on the current thread and dump the stats to path,
+    readable with pstats or snakeviz
+    """
+    import cProfile
+
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        yield profiler
+    finally:
+        profiler.disable()
+        profiler.dump_stats(path)
+
+
+def trace_to(path: str) -> None:
+    """
+    enable instrumentation and write the Chrome trace to path, and the JSON
+    report next to it, when the process exits
+    """
+    enable()
+
+    def write() -> None:
+        export_chrome_trace(path)
+        export_json(os.path.splitext(path)[0] + ".report.json")
+
+    atexit.register(write)
+
+
+if os.environ.get(TRACE_ENV):
+    trace_to(os.environ[TRACE_ENV])
@@ -0,0 +1,198 @@
+import warnings
+
+import numpy as np
+
+
+def _payoff_scale(matrix) -> float:
+    """
+    Upper bound on max |A[i][j]|, used to normalise step sizes.
+    """
+    if hasattr(matrix, "correction"):
+        bound = np.abs(matrix.base).max() + np.abs(matrix.correction.data).max(initial=0)
+    else:
+        bound = np.abs(matrix).max()
+    return max(float(bound), 1e-12)
+
+
+def _result(name: str, x: np.ndarray, y: np.ndarray, best_row: float, best_col: float,
+            iterations: int, tol: float) -> dict:
+    exploitability = best_row - best_col
+    if exploitability > tol:
+        warnings.warn(
+            f"{name} stopped at max_iter={iterations} with exploitability "
+            f"{exploitability:.3g} > tol={tol:.3g}",
+            RuntimeWarning,
+            stacklevel=3,
+        )
+    return {
+        'Hider': x,
+        'Seeker': y,
+        'Game value (v)': (best_row + best_col) / 2,
+        'Exploitability': exploitability,
+        'Iterations': iterations
+    }
+
+
+def fictitious_play(matrix, tol: float = 1e-3, max_iter: int = 100000, callback=None) -> dict:
+    """
+    Solves a zero-sum game with (simultaneous) fictitious play: every round
+    each player best-responds to the other's empirical mixed strategy.
+
+    Fictitious play only converges at roughly O(1/sqrt(T)), so reaching a
+    1e-3 tolerance can take millions of iterations; prefer "rm_plus" or
+    "hedge" when speed matters.
+
+    Args:
+        matrix : The m x n payoff matrix from Player A's perspective,
+            an ndarray or a StructuredPayoff.
+        tol : Stop once the exploitability of the averages is below tol.
+        max_iter : Maximum number of iterations, a RuntimeWarning is issued
+            if tol was not reached by then.
+        callback : Called as callback(iteration, exploitability) every iteration.
+
+    Returns:
+        dict: Average strategies, the estimated game value, the final
+        exploitability and the number of iterations.
+    """
+    m, n = matrix.shape
+    x_count = np.zeros(m)
+    y_count = np.zeros(n)
+    x = np.full(m, 1 / m)
+    y = np.full(n, 1 / n)
+
+    for t in range(1, max_iter + 1):
+        row_values = matrix @ y
+        col_values = x @ matrix
+        best_row, best_col = row_values.max(), col_values.min()
+        exploitability = best_row - best_col
+        if callback is not None:
+            callback(t, exploitability)
+        if exploitability <= tol:
+            break
+
+        x_count[np.argmax(row_values)] += 1
+        y_count[np.argmin(col_values)] += 1
+        x = x_count / t
+        y = y_count / t
+
+    return _result("fictitious_play", x, y, best_row, best_col, t, tol)
+
+
+def hedge(matrix, tol: float = 1e-3, max_iter: int = 100000, callback=None,
+          eta: float | None = None) -> dict:
+    """
+    Solves a zero-sum game by letting both players run optimistic
+    multiplicative weights (Hedge) against each other, i.e. the last payoff
+    is counted twice when picking the next strategy. With a constant step
+    the average strategies converge at O(1/T), unlike the O(1/sqrt(T)) of
+    plain Hedge.
+
+    Args:
+        matrix : The m x n payoff matrix from Player A's perspective,
+            an ndarray or a StructuredPayoff.
+        tol : Stop once the exploitability of the averages is below tol.
+        max_iter : Maximum number of iterations, a RuntimeWarning is issued
+            if tol was not reached by then.
+        callback : Called as callback(iteration, exploitability) every iteration.
+        eta : Learning rate, by default 1 / max |A[i][j]|.
+
+    Returns:
+        dict: Average strategies, the estimated game value, the final
+        exploitability and the number of iterations.
+    """
+    m, n = matrix.shape
+    rate = eta if eta is not None else 1 / _payoff_scale(matrix)
+    # cumulative payoffs, their averages are A @ y_avg and x_avg @ A
+    row_total = np.zeros(m)
+    col_total = np.zeros(n)
+    row_values = np.zeros(m)
+    col_values = np.zeros(n)
+    x_total = np.zeros(m)
+    y_total = np.zeros(n)
+
+    for t in range(1, max_iter + 1):
+        x = rate * (row_total + row_values)
+        x = np.exp(x - x.max())
+        x /= x.sum()
+        y = -rate * (col_total + col_values)
+        y = np.exp(y - y.max())
+        y /= y.sum()
+
+        row_values = matrix @ y
+        col_values = x @ matrix
+        row_total += row_values
+        col_total += col_values
+        x_total += x
+        y_total += y
+        best_row, best_col = row_total.max() / t, col_total.min() / t
+        exploitability = best_row - best_col
+        if callback is not None:
+            callback(t, exploitability)
+        if exploitability <= tol:
+            break
+
+    return _result("hedge", x_total / t, y_total / t, best_row, best_col, t, tol)
+
+
+def regret_matching_plus(matrix, tol: float = 1e-3, max_iter: int = 100000, callback=None) -> dict:
+    """
+    Solves a zero-sum game with alternating regret matching+ and linearly
+    weighted averages.
+
+    Args:
+        matrix : The m x n payoff matrix from Player A's perspective,
+            an ndarray or a StructuredPayoff.
+        tol : Stop once the exploitability of the averages is below tol.
+        max_iter : Maximum number of iterations, a RuntimeWarning is issued
+            if tol was not reached by then.
+        callback : Called as callback(iteration, exploitability) every iteration.
+
+    Returns:
+        dict: Weighted average strategies, the estimated game value, the
+        final exploitability and the number of iterations.
+    """
+    m, n = matrix.shape
+    x_regret = np.zeros(m)
+    y_regret = np.zeros(n)
+    x = np.full(m, 1 / m)
+    y = np.full(n, 1 / n)
+    # weighted sums of the strategies and of the payoffs they were played against
+    x_total = np.zeros(m)
+    y_total = np.zeros(n)
+    row_total = np.zeros(m)
+    col_total = np.zeros(n)
+    weight = 0.0
+
+    for t in range(1, max_iter + 1):
+        row_values = matrix @ y
+        x_regret = np.maximum(x_regret + row_values - x @ row_values, 0)
+        total = x_regret.sum()
+        x = x_regret / total if total > 0 else np.full(m, 1 / m)
+
+        col_values = x @ matrix
+        y_regret = np.maximum(y_regret + y @ col_values - col_values, 0)
+        total = y_regret.sum()
+        new_y = y_regret / total if total > 0 else np.full(n, 1 / n)
+
+        weight += t
+        x_total += t * x
+        col_total += t * col_values
+        y_total += t * y
+        row_total += t * row_values
+        y = new_y
+
+        best_row, best_col = row_total.max() / weight, col_total.min() / weight
+        exploitability = best_row - best_col
+        if callback is not None:
+            callback(t, exploitability)
+        if exploitability <= tol:
+            break
+
+    return _result("rm_plus", x_total / weight, y_total / weight, best_row, best_col, t, tol)
+
+
+SOLVERS = {
+    "fictitious_play": fictitious_play,
+    "hedge": hedge,
+    "rm_plus": regret_matching_plus,
+}
@@ -0,0 +1,90 @@
+import argparse
+import asyncio
+import json
+import time
+
+import numpy as np
+
+from MatchServer import MatchServer
+
+
+async def client(host: str, port: int, sessions: int, rounds: int, pipeline: int, n: int, m: int,
+                 seed: int) -> int:
+    """
+    one connection playing `sessions` sessions for `rounds` rounds each,
+    keeping up to `pipeline` requests in flight
+
+    :return: number of rounds played
+    """
+    reader, writer = await asyncio.open_connection(host, port, limit=1 << 20)
+    rng = np.random.default_rng(seed)
+
+    ids = []
+    for i in range(sessions):
+        role = "hider" if i % 2 == 0 else "seeker"
+        writer.write(json.dumps({"op": "new", "n": n, "m": m, "seed": 0, "role": role}).encode() + b"\n")
+    await writer.drain()
+    for _ in range(sessions):
+        ids.append(json.loads(await reader.readline())["session"])
+
+    requests = [
+        json.dumps({"op": "play", "session": ids[i % sessions], "place": int(place)}).encode() + b"\n"
+        for i, place in enumerate(rng.integers(0, n * m, sessions * rounds))
+    ]
+    played = 0
+    for start in range(0, len(requests), pipeline):
+        window = requests[start:start + pipeline]
+        writer.writelines(window)
+        await writer.drain()
+        for _ in window:
+            response = json.loads(await reader.readline())
+            if "error" in response:
+                raise RuntimeError(response["error"])
+            played += 1
+
+    writer.close()
+    await writer.wait_closed()
+    return played
+
+
+async def load_test(host: str, port: int, clients: int, sessions: int, rounds: int, pipeline: int,
+                    n: int, m: int) -> dict:
+    """
+    run `clients` connections at once against a server and time them
+
+    :return: rounds played, seconds and rounds per second
+    """
+    start = time.perf_counter()
+    played = await asyncio.gather(*(
+        client(host, port, sessions, rounds, pipeline, n, m, seed) for seed in range(clients)))
+    elapsed = time.perf_counter() - start
+    return {"rounds": sum(played), "seconds": elapsed, "rounds_per_second": sum(played) / elapsed}
+
+
+async def main(args) -> None:
+    host, port = args.host, args.port
+    server = None
+    if args.local:
+        # run the server in this process, on a free port
+        server = await MatchServer().serve(host, 0)
+        port = server.sockets[0].getsockname()[1]
+    result = await load_test(host, port, args.clients, args.sessions, args.rounds, args.pipeline, args.n, args.m)
+    print(f"{result['rounds']} rounds in {result['seconds']:.2f}s: {result['rounds_per_second']:.0f} rounds/s")
+    if server is not None:
+        server.close()
+        await server.wait_closed()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Measure the round throughput of a MatchServer.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--local", action="store_true",
+                        help="start a server in this process instead of connecting to a running one")
+    parser.add_argument("--clients", type=int, default=50)
+    parser.add_argument("--sessions", type=int, default=20, help="sessions per client")
+    parser.add_argument("--rounds", type=int, default=100, help="rounds per session")
+    parser.add_argument("--pipeline", type=int, default=64, help="requests each client keeps in flight")
+    parser.add_argument("-n", type=int, default=4)
+    parser.add_argument("-m", type=int, default=4)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,302 @@
+import argparse
+import asyncio
+import itertools
+import json
+from collections import OrderedDict
+
+import numpy as np
+
+from PayoffMatrix import PayoffMatrix
+from StructuredPayoff import StructuredPayoff
+
+# rounds of history every session remembers
+HISTORY = 64
+# largest world (n * m locations) a client may ask for
+MAX_LOCATIONS = 1024
+# solved worlds kept around once no session plays on them any more
+MAX_WORLDS = 32
+
+
+class World:
+    __slots__ = ("payoff", "matrix", "cdf", "types", "sessions")
+
+    def __init__(self, payoff: PayoffMatrix) -> None:
+        """
+        a solved world shared read-only by every session played on it,
+        with the cumulative distributions the computer samples from
+
+        :param payoff: solved PayoffMatrix, must not be changed afterwards
+        """
+        self.payoff = payoff
+        self.matrix = payoff.matrix
+        if isinstance(self.matrix, StructuredPayoff):
+            self.matrix.base.setflags(write=False)
+        else:
+            self.matrix.setflags(write=False)
+        # index 0: the computer hides, 1: the computer seeks
+        self.cdf = (np.cumsum(payoff.probability['Hider']), np.cumsum(payoff.probability['Seeker']))
+        for cdf in self.cdf:
+            cdf /= cdf[-1]
+            cdf.setflags(write=False)
+        self.types = list(payoff.location_type)
+        # sessions playing on the world, it can only be evicted at 0
+        self.sessions = 0
+
+
+class Session:
+    __slots__ = ("id", "world", "perspective", "rounds", "player_score", "computer_score", "history")
+
+    def __init__(self, session_id: int, world: World, perspective: int) -> None:
+        """
+        :param session_id: id the client refers to the session by
+        :param world: the shared world the session plays on
+        :param perspective: 0 if the player hides, 1 if the player seeks
+        """
+        self.id = session_id
+        self.world = world
+        self.perspective = perspective
+        self.rounds = 0
+        self.player_score = 0.0
+        self.computer_score = 0.0
+        # ring buffer of (player, computer) choices, row rounds % HISTORY is next
+        self.history = np.zeros((HISTORY, 2), dtype=np.int32)
+
+    def recent(self) -> list:
+        """
+        the remembered (player, computer) choices, oldest first
+        """
+        if self.rounds <= HISTORY:
+            return self.history[:self.rounds].tolist()
+        start = self.rounds % HISTORY
+        return np.roll(self.history, -start, axis=0).tolist()
+
+
+class MatchServer:
+    def __init__(self, seed: int | None = None) -> None:
+        """
+        JSON-lines over TCP server hosting many GameInterface-style sessions
+
+        every request is one JSON object per line, answered by one line in
+        the same order:
+
+        - {"op": "new", "n": 3, "m": 4, "seed": 0, "role": "hider"} starts a
+          session on the world generated from (n, m, seed)
+        - {"op": "play", "session": id, "place": k} plays one round
+        - {"op": "history", "session": id} returns the last HISTORY rounds
+        - {"op": "close", "session": id} ends a session
+
+        plays that arrive in the same event loop iteration are sampled as
+        one batch per world
+
+        :param seed: seed of the generator computer moves are sampled with
+        """
+        self.rng = np.random.default_rng(seed)
+        self.worlds = OrderedDict()
+        self.sessions = {}
+        self.ids = itertools.count(1)
+        self.batch = []
+        self.rounds = 0
+
+    async def world(self, n: int, m: int, seed: int) -> World:
+        """
+        the shared world for (n, m, seed), solved off the event loop the
+        first time it is asked for; concurrent requests wait for one solve,
+        and a failed solve isn't kept so the next request tries again
+        """
+        key = (n, m, seed)
+        future = self.worlds.get(key)
+        if future is None:
+            loop = asyncio.get_running_loop()
+            future = self.worlds[key] = loop.run_in_executor(
+                None, lambda: World(PayoffMatrix(n, m, rng=np.random.default_rng(seed))))
+            self.evict()
+        else:
+            self.worlds.move_to_end(key)
+        try:
+            # shielded, a request going away must not cancel the others' solve
+            return await asyncio.shield(future)
+        except Exception:
+            if self.worlds.get(key) is future:
+                del self.worlds[key]
+            raise
+
+    def evict(self) -> None:
+        """
+        drop the least recently used worlds no session plays on until at
+        most MAX_WORLDS are left; worlds still being solved are kept
+        """
+        excess = len(self.worlds) - MAX_WORLDS
+        for key, future in list(self.worlds.items()):
+            if excess <= 0:
+                break
+            if future.done() and (future.cancelled() or future.exception() is not None
+                                  or future.result().sessions == 0):
+                del self.worlds[key]
+                excess -= 1
+
+    def close(self, session: Session) -> None:
+        """
+        end a session and let its world be evicted once nobody plays on it
+        """
+        del self.sessions[session.id]
+        session.world.sessions -= 1
+        self.evict()
+
+    def play(self, session: Session, place: int) -> asyncio.Future:
+        """
+        queue a round, the future resolves once its batch is sampled
+        """
+        future = asyncio.get_running_loop().create_future()
+        if not self.batch:
+            asyncio.get_running_loop().call_soon(self.flush)
+        self.batch.append((session, place, future))
+        return future
+
+    def flush(self) -> None:
+        """
+        sample the computer's moves of every queued round, one vectorized
+        draw per world and role, then score the rounds
+        """
+        batch, self.batch = self.batch, []
+        groups = {}
+        for entry in batch:
+            session = entry[0]
+            groups.setdefault((id(session.world), session.perspective), []).append(entry)
+
+        for entries in groups.values():
+            world = entries[0][0].world
+            perspective = entries[0][0].perspective
+            cdf = world.cdf[1 - perspective]
+            places = np.fromiter((place for _, place, _ in entries), dtype=np.int64, count=len(entries))
+            computer = np.searchsorted(cdf, self.rng.random(len(entries)), side='right')
+            np.minimum(computer, len(cdf) - 1, out=computer)
+            if perspective == 0:
+                payoffs = np.asarray(world.matrix[places, computer], dtype=float)
+            else:
+                payoffs = np.asarray(world.matrix[computer, places], dtype=float)
+
+            # the hider gains A[h][s] and the seeker loses it, as in GameInterface.game
+            sign = 1.0 if perspective == 0 else -1.0
+            for (session, place, future), x, value in zip(entries, computer.tolist(), payoffs.tolist()):
+                session.history[session.rounds % HISTORY] = (place, x)
+                session.rounds += 1
+                session.player_score += sign * value
+                session.computer_score -= sign * value
+                if not future.cancelled():
+                    future.set_result({
+                        "session": session.id,
+                        "round": session.rounds,
+                        "computer": x,
+                        "payoff": value,
+                        "player_score": session.player_score,
+                        "computer_score": session.computer_score,
+                    })
+        self.rounds += len(batch)
+
+    async def request(self, message: dict, owned: set) -> dict:
+        if not isinstance(message, dict):
+            raise ValueError("request must be a JSON object")
+        op = message.get("op")
+        if op == "new":
+            n, m = int(message.get("n", 1)), int(message.get("m", 1))
+            if n < 1 or m < 1:
+                raise ValueError("n and m must be positive")
+            if n * m > MAX_LOCATIONS:
+                raise ValueError(f"worlds have at most {MAX_LOCATIONS} locations, got {n * m}")
+            role = message.get("role", "hider")
+            if role not in ("hider", "seeker"):
+                raise ValueError(f"role must be 'hider' or 'seeker', got {role!r}")
+            world = await self.world(n, m, int(message.get("seed", 0)))
+            perspective = 0 if role == "hider" else 1
+            session = Session(next(self.ids), world, perspective)
+            world.sessions += 1
+            self.sessions[session.id] = session
+            owned.add(session.id)
+            return {"session": session.id, "n": n, "m": m, "types": world.types,
+                    "value": world.payoff.probability['Game value (v)']}
+
+        session = self.sessions.get(message.get("session"))
+        if session is None or session.id not in owned:
+            raise ValueError(f"no session {message.get('session')!r}")
+        if op == "play":
+            place = int(message["place"])
+            size = len(session.world.types)
+            if not 0 <= place < size:
+                raise ValueError(f"place must be in [0, {size})")
+            return await self.play(session, place)
+        if op == "history":
+            return {"session": session.id, "rounds": session.rounds, "history": session.recent()}
+        if op == "close":
+            owned.discard(session.id)
+            self.close(session)
+            return {"session": session.id, "closed": True}
+        raise ValueError(f"unknown op {op!r}")
+
+    async def respond(self, line: bytes, owned: set) -> dict:
+        """
+        the answer to one request line; whatever goes wrong, including a
+        failed solve, is answered with {"error": ...} so the connection
+        keeps its order and stays usable
+        """
+        try:
+            return await self.request(json.loads(line), owned)
+        except Exception as error:
+            return {"error": str(error) or type(error).__name__}
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """
+        serve one connection; requests are read ahead so a client can
+        pipeline rounds, and the answers are written back in order
+        """
+        owned = set()
+        pending = asyncio.Queue()
+
+        async def send() -> None:
+            while (task := await pending.get()) is not None:
+                writer.write(json.dumps(await task).encode() + b"\n")
+                if pending.empty():
+                    await writer.drain()
+
+        sender = asyncio.create_task(send())
+        try:
+            async for line in reader:
+                if line.strip():
+                    await pending.put(asyncio.ensure_future(self.respond(line, owned)))
+        except ConnectionError:
+            pass
+        finally:
+            await pending.put(None)
+            try:
+                await sender
+            except OSError:
+                pass
+            finally:
+                # answers nobody will read, e.g. after the sender failed,
+                # must not open sessions once the connection is cleaned up
+                while not pending.empty():
+                    task = pending.get_nowait()
+                    if task is not None:
+                        task.cancel()
+                # the sessions go away with the connection, however it ended
+                for session_id in owned:
+                    if session_id in self.sessions:
+                        self.close(self.sessions[session_id])
+                writer.close()
+
+    async def serve(self, host: str = "127.0.0.1", port: int = 8765) -> asyncio.Server:
+        return await asyncio.start_server(self.handle, host, port, limit=1 << 20)
+
+
+async def main(host: str, port: int) -> None:
+    server = await MatchServer().serve(host, port)
+    print(f"serving on {', '.join(str(s.getsockname()) for s in server.sockets)}", flush=True)
+    async with server:
+        await server.serve_forever()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serve hide and seek matches as JSON lines over TCP.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+    asyncio.run(main(args.host, args.port))
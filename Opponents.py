@@ -0,0 +1,289 @@
+import math
+from collections import deque
+
+import numpy as np
+
+from StructuredPayoff import StructuredPayoff
+
+
+class FenwickTree:
+    """
+    Prefix sums over non-negative weights with O(log n) point updates and
+    O(log n) sampling proportional to the weights.
+    """
+
+    def __init__(self, weights):
+        self.n = len(weights)
+        self.tree = [0.0] * (self.n + 1)
+        for i, w in enumerate(weights, 1):
+            self.tree[i] += w
+            parent = i + (i & -i)
+            if parent <= self.n:
+                self.tree[parent] += self.tree[i]
+        self.total = float(sum(weights))
+
+    def add(self, i: int, delta: float) -> None:
+        self.total += delta
+        i += 1
+        while i <= self.n:
+            self.tree[i] += delta
+            i += i & -i
+
+    def find(self, u: float) -> int:
+        """
+        Index of the weight u falls into, for 0 <= u < total.
+        """
+        pos = 0
+        step = 1 << self.n.bit_length()
+        while step:
+            nxt = pos + step
+            if nxt <= self.n and self.tree[nxt] <= u:
+                pos = nxt
+                u -= self.tree[nxt]
+            step >>= 1
+        return min(pos, self.n - 1)
+
+
+class MaxTree:
+    """
+    Segment tree keeping the maximum of an array and where it is, with
+    O(log n) point updates.
+    """
+
+    def __init__(self, values):
+        self.n = 1 << max(len(values) - 1, 0).bit_length()
+        self.value = [-math.inf] * (2 * self.n)
+        self.index = [-1] * (2 * self.n)
+        for i, v in enumerate(values):
+            self.value[self.n + i] = v
+            self.index[self.n + i] = i
+        for pos in range(self.n - 1, 0, -1):
+            self._pull(pos)
+
+    def _pull(self, pos: int) -> None:
+        left, right = 2 * pos, 2 * pos + 1
+        best = left if self.value[left] >= self.value[right] else right
+        self.value[pos] = self.value[best]
+        self.index[pos] = self.index[best]
+
+    def add(self, i: int, delta: float) -> None:
+        pos = self.n + i
+        self.value[pos] += delta
+        pos //= 2
+        while pos:
+            self._pull(pos)
+            pos //= 2
+
+    def top(self) -> tuple:
+        return self.value[1], self.index[1]
+
+
+def _utility_parts(matrix: StructuredPayoff, computer_is_hider: bool):
+    """
+    Split the computer's payoff U[c][p] (c its move, p the player's) into
+    coefficient[c] + incidence[p][c], so that sum_p count[p] * U[c][p] is
+    coefficient[c] * sum(count) plus a vector whose updates only touch the
+    few non-zero entries of one incidence row.
+    """
+    if computer_is_hider:
+        # U[c][p] = A[c][p] = base[c] + C[c][p]
+        return matrix.base, matrix.correction.T
+    # U[c][p] = -A[p][c] = -base[p] - C[p][c]; -base[p] is the same for every c
+    return np.zeros(matrix.shape[1]), -matrix.correction
+
+
+class EquilibriumOpponent:
+    """
+    Plays the equilibrium strategy, sampled by binary search over its
+    precomputed cumulative distribution.
+    """
+
+    def __init__(self, matrix, strategy: np.ndarray, computer_is_hider: bool,
+                 rng: np.random.Generator | None = None):
+        self.cdf = np.cumsum(strategy)
+        self.rng = np.random.default_rng() if rng is None else rng
+
+    def choose(self) -> int:
+        i = int(np.searchsorted(self.cdf, self.rng.random() * self.cdf[-1], side='right'))
+        return min(i, len(self.cdf) - 1)
+
+    def observe(self, player: int, computer: int) -> None:
+        pass
+
+
+class FrequencyOpponent(EquilibriumOpponent):
+    """
+    Best-responds to the empirical frequencies of the player's moves. The
+    expected payoff of every computer move is kept up to date with one
+    segment tree per distinct coefficient, so each round costs
+    O(log size) times the few non-zero correction entries of the move.
+    """
+
+    def __init__(self, matrix: StructuredPayoff, strategy: np.ndarray, computer_is_hider: bool,
+                 rng: np.random.Generator | None = None):
+        super().__init__(matrix, strategy, computer_is_hider, rng)
+        coefficient, incidence = _utility_parts(matrix, computer_is_hider)
+        self.incidence = incidence.tocsr()
+        self.rounds = 0
+
+        self.groups = []
+        self.group_of = np.zeros(len(coefficient), dtype=int)
+        self.position = np.zeros(len(coefficient), dtype=int)
+        for g, value in enumerate(np.unique(coefficient)):
+            members = np.flatnonzero(coefficient == value)
+            self.group_of[members] = g
+            self.position[members] = np.arange(len(members))
+            self.groups.append((float(value), members, MaxTree([0.0] * len(members))))
+
+    def choose(self) -> int:
+        if self.rounds == 0:
+            return super().choose()
+        best, move = -math.inf, 0
+        for value, members, tree in self.groups:
+            total, i = tree.top()
+            if value * self.rounds + total > best:
+                best, move = value * self.rounds + total, int(members[i])
+        return move
+
+    def observe(self, player: int, computer: int) -> None:
+        self.rounds += 1
+        start, end = self.incidence.indptr[player], self.incidence.indptr[player + 1]
+        for c, delta in zip(self.incidence.indices[start:end], self.incidence.data[start:end]):
+            _, _, tree = self.groups[self.group_of[c]]
+            tree.add(int(self.position[c]), float(delta))
+
+
+class Exp3Opponent(EquilibriumOpponent):
+    """
+    EXP3 over the computer's moves: only the weight of the move that was
+    played changes each round, so sampling and updating both go through a
+    Fenwick tree in O(log size).
+    """
+
+    def __init__(self, matrix: StructuredPayoff, strategy: np.ndarray, computer_is_hider: bool,
+                 rng: np.random.Generator | None = None, gamma: float = 0.1):
+        super().__init__(matrix, strategy, computer_is_hider, rng)
+        self.matrix = matrix
+        self.computer_is_hider = computer_is_hider
+        self.gamma = gamma
+        self.k = matrix.shape[0]
+        self.weights = [1.0] * self.k
+        self.tree = FenwickTree(self.weights)
+
+        # rewards are rescaled to [0, 1] with the extreme payoffs
+        correction = matrix.correction.tocsr()
+        entries = np.concatenate((matrix.base, np.repeat(matrix.base, np.diff(correction.indptr)) + correction.data))
+        self.low, self.high = float(entries.min()), float(entries.max())
+        if not computer_is_hider:
+            self.low, self.high = -self.high, -self.low
+
+    def choose(self) -> int:
+        if self.rng.random() < self.gamma:
+            return int(self.rng.integers(self.k))
+        return self.tree.find(self.rng.random() * self.tree.total)
+
+    def observe(self, player: int, computer: int) -> None:
+        if self.computer_is_hider:
+            payoff = self.matrix[computer, player]
+        else:
+            payoff = -self.matrix[player, computer]
+        reward = (payoff - self.low) / max(self.high - self.low, 1e-12)
+        p = (1 - self.gamma) * self.weights[computer] / self.tree.total + self.gamma / self.k
+
+        old = self.weights[computer]
+        self.weights[computer] = old * math.exp(self.gamma * reward / (p * self.k))
+        self.tree.add(computer, self.weights[computer] - old)
+        if self.tree.total > 1e200:
+            # rescaling is O(size) but happens at most every few hundred rounds
+            self.weights = [w / self.tree.total for w in self.weights]
+            self.tree = FenwickTree(self.weights)
+
+
+class MarkovOpponent(EquilibriumOpponent):
+    """
+    Predicts the player's next move from their last one, using the
+    transitions seen in a sliding window, and best-responds to it. Counts
+    are kept in frequency buckets so the most likely next move is known in
+    O(1) even as old transitions leave the window.
+    """
+
+    def __init__(self, matrix: StructuredPayoff, strategy: np.ndarray, computer_is_hider: bool,
+                 rng: np.random.Generator | None = None, window: int = 50):
+        super().__init__(matrix, strategy, computer_is_hider, rng)
+        self.matrix = matrix
+        self.computer_is_hider = computer_is_hider
+        self.window = window
+        self.last = None
+        self.transitions = deque()
+        self.counts = {}
+        self.buckets = {}
+        self.top = {}
+        self.responses = {}
+
+    def _shift(self, prev: int, nxt: int, delta: int) -> None:
+        buckets = self.buckets.setdefault(prev, {})
+        old = self.counts.get((prev, nxt), 0)
+        new = old + delta
+        if old:
+            buckets[old].discard(nxt)
+        if new:
+            buckets.setdefault(new, set()).add(nxt)
+            self.counts[(prev, nxt)] = new
+        else:
+            del self.counts[(prev, nxt)]
+
+        top = self.top.get(prev, 0)
+        if new > top:
+            self.top[prev] = new
+        elif old == top and not buckets.get(old):
+            self.top[prev] = top - 1
+
+    def best_response(self, player: int) -> int:
+        if player not in self.responses:
+            if self.computer_is_hider:
+                self.responses[player] = int(np.argmax(self.matrix[:, player]))
+            else:
+                self.responses[player] = int(np.argmin(self.matrix[player]))
+        return self.responses[player]
+
+    def choose(self) -> int:
+        top = self.top.get(self.last, 0)
+        if not top:
+            return super().choose()
+        predicted = next(iter(self.buckets[self.last][top]))
+        return self.best_response(predicted)
+
+    def observe(self, player: int, computer: int) -> None:
+        if self.last is not None:
+            self.transitions.append((self.last, player))
+            self._shift(self.last, player, 1)
+            if len(self.transitions) > self.window:
+                self._shift(*self.transitions.popleft(), -1)
+        self.last = player
+
+
+OPPONENTS = {
+    "equilibrium": EquilibriumOpponent,
+    "frequency": FrequencyOpponent,
+    "exp3": Exp3Opponent,
+    "markov": MarkovOpponent,
+}
+
+
+def make_opponent(name: str, matrix: StructuredPayoff, strategy: np.ndarray, computer_is_hider: bool,
+                  rng: np.random.Generator | None = None, **options):
+    """
+    Build the computer opponent called name.
+
+    Args:
+        name : One of OPPONENTS.
+        matrix : The payoff matrix from the Hider's perspective.
+        strategy : The computer's equilibrium strategy, the fallback of
+            every adaptive opponent.
+        computer_is_hider : Whether the computer hides (rows) or seeks (columns).
+        rng : Random generator to sample moves with.
+        **options : Passed on to the opponent, e.g. gamma or window.
+    """
+    if name not in OPPONENTS:
+        raise ValueError(f"unknown opponent {name!r}, expected one of {sorted(OPPONENTS)}")
+    return OPPONENTS[name](matrix, strategy, computer_is_hider, rng, **options)
@@ -1,63 +1,398 @@
+import hashlib
+import json
+import os
 import random
 import numpy as np
 
-from StrategyFinder import solve_zero_sum_game
+from Instrumentation import count, snapshot, span
+from SolveCache import DEFAULT_CACHE, EquilibriumCache, cache_key
+from StrategyFinder import solve_warm, solve_zero_sum_game
+from StructuredPayoff import StructuredPayoff
+from SymmetryReduction import solve_reduced
+
+# neighbour rings around a location and the multiplier applied to them
+NEIGHBOUR_RINGS = (
+    (((0, 1), (0, -1), (-1, 0), (1, 0)), 0.5),
+    (((0, 2), (0, -2), (-2, 0), (2, 0)), 0.75),
+)
+
+# worlds with more locations than this are stored as a StructuredPayoff,
+# around 6x6 the sparse LP already solves faster than the dense one
+SPARSE_THRESHOLD = 36
+
+# bump whenever the matrix definition or the solvers change what a saved
+# world means, so load refuses files from another version
+SOLVER_VERSION = 1
+FORMAT_VERSION = 1
+
+
+def build_matrix(location_type, n: int, m: int) -> np.ndarray:
+    """
+    build the payoff matrix of an n x m world as a float array
+
+    :param location_type: type (1, 2 or 3) of every location, row-major
+    :param n: number of rows
+    :param m: number of columns
+    :return: (n*m) x (n*m) payoff matrix from the hider's perspective
+    """
+    types = np.asarray(location_type)
+    size = n * m
+
+    # every hider row starts at 1, or 2 for type 2 locations
+    matrix = np.repeat(np.where(types == 2, 2.0, 1.0)[:, None], size, axis=1)
+    matrix[np.arange(size), np.arange(size)] = np.where(types == 3, -3.0, -1.0)
+
+    rows, cols = np.divmod(np.arange(size), m)
+    for offsets, factor in NEIGHBOUR_RINGS:
+        for dr, dc in offsets:
+            mask = (0 <= rows + dr) & (rows + dr < n) & (0 <= cols + dc) & (cols + dc < m)
+            i = np.flatnonzero(mask)
+            matrix[i, i + dr * m + dc] *= factor
+
+    return matrix
+
+
+def build_block(location_type, n: int, m: int, rows, cols) -> np.ndarray:
+    """
+    build only some rows and columns of the payoff matrix of an n x m
+    world, used to update a matrix after a small change to the world
+
+    :param location_type: type (1, 2 or 3) of every location, row-major
+    :param n: number of rows
+    :param m: number of columns
+    :param rows: hider locations to build
+    :param cols: seeker locations to build
+    :return: len(rows) x len(cols) block of the payoff matrix
+    """
+    types = np.asarray(location_type)
+    rows = np.asarray(rows, dtype=int)
+    cols = np.asarray(cols, dtype=int)
+
+    row_r, row_c = np.divmod(rows, m)
+    col_r, col_c = np.divmod(cols, m)
+    dr = col_r[None, :] - row_r[:, None]
+    dc = col_c[None, :] - row_c[:, None]
+    factor = np.ones((len(rows), len(cols)))
+    for offsets, ring_factor in NEIGHBOUR_RINGS:
+        for offset_r, offset_c in offsets:
+            factor[(dr == offset_r) & (dc == offset_c)] = ring_factor
+
+    block = np.where(types[rows] == 2, 2.0, 1.0)[:, None] * factor
+    diagonal = np.where(types[rows] == 3, -3.0, -1.0)[:, None]
+    return np.where(rows[:, None] == cols[None, :], diagonal, block)
+
+
+def build_structured(location_type, n: int, m: int) -> StructuredPayoff:
+    """
+    build the payoff matrix of an n x m world without materialising it,
+    as a per-row base value plus a sparse correction for the diagonal and
+    the neighbour rings
+
+    :param location_type: type (1, 2 or 3) of every location, row-major
+    :param n: number of rows
+    :param m: number of columns
+    :return: payoff matrix from the hider's perspective
+    """
+    types = np.asarray(location_type)
+    size = n * m
+    base = np.where(types == 2, 2.0, 1.0)
+
+    index = np.arange(size)
+    rows_list = [index]
+    cols_list = [index]
+    values_list = [np.where(types == 3, -3.0, -1.0) - base]
+
+    rows, cols = np.divmod(index, m)
+    for offsets, factor in NEIGHBOUR_RINGS:
+        for dr, dc in offsets:
+            mask = (0 <= rows + dr) & (rows + dr < n) & (0 <= cols + dc) & (cols + dc < m)
+            i = np.flatnonzero(mask)
+            rows_list.append(i)
+            cols_list.append(i + dr * m + dc)
+            values_list.append(base[i] * (factor - 1))
+
+    from scipy.sparse import coo_array
+
+    correction = coo_array(
+        (np.concatenate(values_list), (np.concatenate(rows_list), np.concatenate(cols_list))),
+        shape=(size, size),
+    )
+    return StructuredPayoff(base, correction)
+
 
 class PayoffMatrix:
-    def __init__(self,n: int,m: int) -> None:
+    def __init__(self,n: int,m: int, sparse: bool | None = None, reduce: bool = True,
+                 rng: np.random.Generator | None = None,
+                 cache: EquilibriumCache | None = DEFAULT_CACHE, method: str = "dual") -> None:
         """
         initialize the payoff matrix
 
         :param n: number of rows
         :param m: number of columns
+        :param sparse: store the matrix as a StructuredPayoff instead of a
+            dense array, by default worlds above SPARSE_THRESHOLD
+            locations are stored that way
+        :param reduce: solve the symmetry quotient of the world with
+            dominated strategies removed instead of the full game
+        :param rng: generator to draw the location types from, the global
+            random module is used if None
+        :param cache: where to look up and store the equilibrium, None to
+            always solve
+        :param method: solver passed on to solve_zero_sum_game
 
         """
         self.size = n*m
         self.n = n
         self.m = m
-        self.matrix = [[0 for _ in range(self.size)] for _ in range(self.size)]
+        self.sparse = self.size > SPARSE_THRESHOLD if sparse is None else sparse
+        self.reduce = reduce
+        self.rng = rng
+        self.cache = cache
+        self.method = method
+        self.matrix = None
         self.location_type = [0]*self.size
         self.initialize()
 
     def initialize(self) -> None:
-        for i in range(self.size):
-            self.location_type[i] = random.randint(1,3)
+        if self.rng is not None:
+            self.location_type = self.rng.integers(1, 4, self.size).tolist()
+        else:
+            for i in range(self.size):
+                self.location_type[i] = random.randint(1,3)
+
+        with span("PayoffMatrix build", n=self.n, m=self.m, sparse=self.sparse):
+            if self.sparse:
+                self.matrix = build_structured(self.location_type, self.n, self.m)
+            else:
+                self.matrix = build_matrix(self.location_type, self.n, self.m)
+        snapshot("matrix built")
+
+        self.probability = self.solve()
+        snapshot("game solved")
+
+    def random_type(self) -> int:
+        if self.rng is not None:
+            return int(self.rng.integers(1, 4))
+        return random.randint(1,3)
 
-        for i in range(self.size):
-            for j in range(self.size):
-                ri, ci = self.to2d(i)
-                rj, cj = self.to2d(j)
-                self.matrix[i][j] = 1
+    def set_location_type(self, ind: int, value: int, resolve: bool = True) -> None:
+        """
+        change the type of one location; only its row of the matrix depends
+        on it, so only that row is rebuilt
 
-                if self.location_type[i] == 2:
-                    self.matrix[i][j] = 2
+        :param ind: location to change
+        :param value: new type, 1, 2 or 3
+        :param resolve: re-solve the game warm-started from the current equilibrium
+        """
+        self.location_type[ind] = value
+        if self.sparse:
+            # the row's pattern (diagonal and neighbour rings) doesn't depend
+            # on the type, only its base and corrections do
+            cols = self.matrix.row_columns(ind)
+            base = 2.0 if value == 2 else 1.0
+            self.matrix.set_row(ind, base, build_block(self.location_type, self.n, self.m, [ind], cols)[0] - base)
+        else:
+            self.matrix[ind, :] = build_block(self.location_type, self.n, self.m, [ind], np.arange(self.size))[0]
+        if resolve:
+            self.probability = self.solve(warm_start=self.probability)
 
-                if i == j :
-                    self.matrix[i][j] = -1
-                    if self.location_type[i] == 3:
-                        self.matrix[i][j] = -3
+    def resize(self, n: int, m: int, resolve: bool = True) -> None:
+        """
+        grow or shrink the world, keeping the type of every location that
+        is still on the grid and drawing types for the new ones; entries
+        between kept locations are copied, only the rows and columns of
+        new locations are built
 
-        for i in range(self.size):
-            row, col = self.to2d(i)
-            done = [[False for _ in range(self.size)] for _ in range(self.size)]
+        :param n: new number of rows
+        :param m: new number of columns
+        :param resolve: re-solve the game warm-started from the current
+            equilibrium; otherwise probability is None until solve() is called
+        """
+        rows, cols = np.divmod(np.arange(n * m), m)
+        kept_new = np.flatnonzero((rows < self.n) & (cols < self.m))
+        kept_old = rows[kept_new] * self.m + cols[kept_new]
+        added = np.flatnonzero((rows >= self.n) | (cols >= self.m))
 
-            dx = [0,0,-1,1]
-            dy = [1,-1,0,0]
+        location_type = [0] * (n * m)
+        for new, old in zip(kept_new, kept_old):
+            location_type[new] = self.location_type[old]
+        for new in added:
+            location_type[new] = self.random_type()
 
-            for j in range(len(dx)):
-                if 0 <= row + dx[j] < self.n and 0 <= col + dy[j] < self.m and done[i][self.to1d(row+dx[j],col+dy[j])] == False:
-                    done[i][self.to1d(row+dx[j],col+dy[j])] = True
-                    self.matrix[i][self.to1d(row+dx[j],col+dy[j])] *=0.5
-            dx = [0, 0, -2, 2]
-            dy = [2, -2, 0, 0]
+        old_matrix = self.matrix
+        self.n, self.m, self.size = n, m, n * m
+        self.location_type = location_type
+        if self.sparse:
+            self.matrix = build_structured(location_type, n, m)
+        else:
+            self.matrix = np.empty((self.size, self.size))
+            self.matrix[np.ix_(kept_new, kept_new)] = old_matrix[np.ix_(kept_old, kept_old)]
+            self.matrix[added, :] = build_block(location_type, n, m, added, np.arange(self.size))
+            self.matrix[np.ix_(kept_new, added)] = build_block(location_type, n, m, kept_new, added)
 
-            for j in range(len(dx)):
-                if 0 <= row + dx[j] < self.n and 0 <= col + dy[j] < self.m and done[i][self.to1d(row + dx[j], col + dy[j])] == False:
-                    done[i][self.to1d(row + dx[j], col + dy[j])] = True
-                    self.matrix[i][self.to1d(row + dx[j], col + dy[j])] *= 0.75
+        if not resolve:
+            self.probability = None
+            return
+        # the strategies restricted to the kept locations no longer sum to 1,
+        # so they are only good as a warm start
+        previous = None
+        if self.probability is not None:
+            previous = {}
+            for name in ('Hider', 'Seeker'):
+                previous[name] = np.zeros(self.size)
+                previous[name][kept_new] = self.probability[name][kept_old]
+        self.probability = self.solve(warm_start=previous)
 
-        self.probability = solve_zero_sum_game(self.matrix)
+    def solve(self, warm_start: dict | None = None) -> dict:
+        """
+        solve the game, going through the equilibrium cache if there is one
+
+        :param warm_start: a previous equilibrium of a similar world; dense
+            matrices are then re-solved by double oracle from its supports.
+            Structured matrices ignore it, their sparse LP is already
+            faster than the restricted dense games
+        :return: optimal strategies and game value
+        """
+        with span("PayoffMatrix solve", n=self.n, m=self.m, warm=warm_start is not None) as s:
+            result = self._solve(warm_start)
+            s.set(value=result['Game value (v)'])
+        return result
 
+    def _solve(self, warm_start: dict | None) -> dict:
+        key = None
+        if self.cache is not None:
+            key = cache_key(self.matrix, reduce=self.reduce, method=self.method)
+            result = self.cache.get(key)
+            if result is not None:
+                count("cache.hits")
+                return result
+            count("cache.misses")
+
+        if warm_start is not None and not self.sparse:
+            result = solve_warm(self.matrix,
+                                np.flatnonzero(warm_start['Hider'] > 1e-9),
+                                np.flatnonzero(warm_start['Seeker'] > 1e-9), self.method)
+        elif self.reduce:
+            result = solve_reduced(self.matrix, self.location_type, self.n, self.m, self.method)
+        else:
+            result = solve_zero_sum_game(self.matrix, self.method)
+
+        if key is not None:
+            self.cache.put(key, result)
+        return result
+
+
+    def save(self, directory: str) -> None:
+        """
+        save the matrix, location types and solved strategies as one .npy
+        file each, plus a meta.json with the dimensions, checksums and the
+        solver version; .npy can be memory mapped back by load
+
+        :param directory: directory to write into, created if missing
+        """
+        os.makedirs(directory, exist_ok=True)
+        arrays = {
+            "location_type": np.asarray(self.location_type, dtype=np.int8),
+            "hider": np.asarray(self.probability['Hider'], dtype=float),
+            "seeker": np.asarray(self.probability['Seeker'], dtype=float),
+        }
+        if isinstance(self.matrix, StructuredPayoff):
+            correction = self.matrix.correction
+            arrays.update(base=self.matrix.base, correction_data=correction.data,
+                          correction_indices=correction.indices, correction_indptr=correction.indptr)
+        else:
+            arrays["matrix"] = np.asarray(self.matrix, dtype=float)
+
+        files = {}
+        for name, array in arrays.items():
+            path = os.path.join(directory, name + ".npy")
+            np.save(path, array)
+            files[name] = {"shape": list(array.shape), "dtype": array.dtype.str, "sha256": _file_digest(path)}
+
+        meta = {
+            "format": FORMAT_VERSION,
+            "solver_version": SOLVER_VERSION,
+            "n": self.n,
+            "m": self.m,
+            "one_d": self.n == 1,
+            "sparse": isinstance(self.matrix, StructuredPayoff),
+            "reduce": self.reduce,
+            "method": self.method,
+            "game_value": float(self.probability['Game value (v)']),
+            "files": files,
+        }
+        # meta.json goes last, a directory without it was never fully saved
+        temporary = os.path.join(directory, "meta.json.tmp")
+        with open(temporary, "w") as f:
+            json.dump(meta, f, indent=2)
+        os.replace(temporary, os.path.join(directory, "meta.json"))
+
+    @classmethod
+    def load(cls, directory: str, n: int | None = None, m: int | None = None, one_d: bool | None = None,
+             mmap_mode: str | None = "r", verify: bool = True,
+             cache: EquilibriumCache | None = DEFAULT_CACHE) -> "PayoffMatrix":
+        """
+        load a world written by save; dense matrices are memory mapped, so
+        only the rows that are used get read from disk
+
+        :param directory: directory save wrote to
+        :param n: expected number of rows, not checked if None
+        :param m: expected number of columns, not checked if None
+        :param one_d: expect a 1D (True) or 2D (False) world, not checked if None
+        :param mmap_mode: passed to np.load; "r" is read-only, "c" allows
+            in-place edits such as set_location_type without touching the
+            file, None reads everything into memory
+        :param verify: check every file against its checksum first, which
+            reads each file once
+        :param cache: equilibrium cache of the loaded world
+        :return: the saved PayoffMatrix
+        """
+        with open(os.path.join(directory, "meta.json")) as f:
+            meta = json.load(f)
+        if meta["format"] != FORMAT_VERSION or meta["solver_version"] != SOLVER_VERSION:
+            raise ValueError(f"{directory} was saved with format {meta['format']}, solver version "
+                             f"{meta['solver_version']}; expected {FORMAT_VERSION}, {SOLVER_VERSION}")
+        expected = {"n": n, "m": m, "one_d": one_d}
+        for key, value in expected.items():
+            if value is not None and meta[key] != value:
+                raise ValueError(f"{directory} holds a world with {key}={meta[key]}, expected {value}")
+
+        size = meta["n"] * meta["m"]
+        arrays = {}
+        for name, info in meta["files"].items():
+            path = os.path.join(directory, name + ".npy")
+            if verify and _file_digest(path) != info["sha256"]:
+                raise ValueError(f"checksum mismatch in {path}")
+            arrays[name] = np.load(path, mmap_mode=mmap_mode)
+            if list(arrays[name].shape) != info["shape"]:
+                raise ValueError(f"{path} has shape {arrays[name].shape}, expected {info['shape']}")
+        if len(arrays["location_type"]) != size:
+            raise ValueError(f"{directory} has {len(arrays['location_type'])} locations, expected {size}")
+
+        payoff = cls.__new__(cls)
+        payoff.n, payoff.m, payoff.size = meta["n"], meta["m"], size
+        payoff.sparse = meta["sparse"]
+        payoff.reduce = meta["reduce"]
+        payoff.method = meta["method"]
+        payoff.rng = None
+        payoff.cache = cache
+        payoff.location_type = arrays["location_type"].tolist()
+        if payoff.sparse:
+            from scipy.sparse import csr_array
+
+            correction = csr_array((arrays["correction_data"], arrays["correction_indices"],
+                                    arrays["correction_indptr"]), shape=(size, size))
+            payoff.matrix = StructuredPayoff(arrays["base"], correction)
+        else:
+            payoff.matrix = arrays["matrix"]
+            if payoff.matrix.shape != (size, size):
+                raise ValueError(f"{directory} has a {payoff.matrix.shape} matrix, expected {(size, size)}")
+        payoff.probability = {
+            'Hider': arrays["hider"],
+            'Seeker': arrays["seeker"],
+            'Game value (v)': meta["game_value"]
+        }
+        return payoff
 
     def to2d(self,ind:int) -> tuple:
         return ind // self.m, ind % self.m
@@ -65,6 +400,14 @@ class PayoffMatrix:
     def to1d(self,i: int, j: int) -> int:
         return (i) * self.m + j
 
+def _file_digest(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
 if __name__ == "__main__":
     x = PayoffMatrix(2,3)
     print(x.location_type)
@@ -0,0 +1,111 @@
+from PyQt6.QtCore import QRect, QSize, Qt, pyqtSignal
+from PyQt6.QtGui import QColor, QPainter
+from PyQt6.QtWidgets import QSizePolicy, QWidget
+
+# background and text colour of every location type
+TYPE_COLORS = {
+    1: (QColor("blue"), QColor("white")),
+    2: (QColor("green"), QColor("white")),
+    3: (QColor("red"), QColor("white")),
+}
+# the player's and computer's places when they differ, and when they are the same
+DIFFERENT_COLORS = (QColor("yellow"), QColor("black"))
+SAME_COLORS = (QColor("black"), QColor("white"))
+# below this cell size the location indices are not drawn
+MIN_LABEL_SIZE = 18
+
+
+class PlaceGrid(QWidget):
+    place_clicked = pyqtSignal(int)
+
+    def __init__(self, parent=None) -> None:
+        """
+        the world as one custom-painted grid instead of a button per
+        location; clicks are hit-tested here and only the cells whose
+        colour changes get repainted
+        """
+        super().__init__(parent)
+        self.n = 0
+        self.m = 0
+        self.location_type = []
+        self.highlighted = {}
+        self.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Expanding)
+        self.setMinimumSize(QSize(120, 120))
+
+    def sizeHint(self) -> QSize:
+        return QSize(256, 192)
+
+    def clear(self) -> None:
+        self.set_world(0, 0, [])
+
+    def set_world(self, n: int, m: int, location_type) -> None:
+        self.n = n
+        self.m = m
+        self.location_type = list(location_type)
+        self.highlighted = {}
+        self.update()
+
+    def highlight(self, player_idx: int, computer_idx: int) -> None:
+        """
+        mark both places yellow if they differ, black if they are the same
+        """
+        self.clear_highlight()
+        if player_idx == computer_idx:
+            self.highlighted = {player_idx: SAME_COLORS}
+        else:
+            self.highlighted = {player_idx: DIFFERENT_COLORS, computer_idx: DIFFERENT_COLORS}
+        for idx in self.highlighted:
+            self.update(self.cell_rect(idx))
+
+    def clear_highlight(self) -> None:
+        previous, self.highlighted = self.highlighted, {}
+        for idx in previous:
+            self.update(self.cell_rect(idx))
+
+    def cell_size(self) -> int:
+        if self.n == 0 or self.m == 0:
+            return 0
+        return max(1, min(self.width() // self.m, self.height() // self.n))
+
+    def cell_rect(self, idx: int) -> QRect:
+        size = self.cell_size()
+        row, col = divmod(idx, self.m)
+        return QRect(col * size, row * size, size, size)
+
+    def index_at(self, x: int, y: int) -> int | None:
+        size = self.cell_size()
+        if size == 0:
+            return None
+        row, col = y // size, x // size
+        if 0 <= row < self.n and 0 <= col < self.m:
+            return row * self.m + col
+        return None
+
+    def mousePressEvent(self, event) -> None:
+        if event.button() != Qt.MouseButton.LeftButton:
+            return
+        idx = self.index_at(int(event.position().x()), int(event.position().y()))
+        if idx is not None:
+            self.place_clicked.emit(idx)
+
+    def paintEvent(self, event) -> None:
+        size = self.cell_size()
+        if size == 0:
+            return
+        # only walk the cells that intersect the area being repainted
+        area = event.rect()
+        first_row, last_row = area.top() // size, min(self.n - 1, area.bottom() // size)
+        first_col, last_col = area.left() // size, min(self.m - 1, area.right() // size)
+
+        painter = QPainter(self)
+        for row in range(first_row, last_row + 1):
+            for col in range(first_col, last_col + 1):
+                idx = row * self.m + col
+                background, text = self.highlighted.get(
+                    idx, TYPE_COLORS.get(self.location_type[idx], (QColor("lightgray"), QColor("black"))))
+                rect = QRect(col * size, row * size, size, size)
+                painter.fillRect(rect.adjusted(0, 0, -1, -1), background)
+                if size >= MIN_LABEL_SIZE:
+                    painter.setPen(text)
+                    painter.drawText(rect, Qt.AlignmentFlag.AlignCenter, str(idx))
+        painter.end()
@@ -0,0 +1,125 @@
+import numpy as np
+from PyQt6.QtCore import QPointF, QRectF, QSize, Qt
+from PyQt6.QtGui import QColor, QPainter, QPen, QPolygonF
+from PyQt6.QtWidgets import QWidget
+
+HIDER_COLOR = QColor("green")
+SEEKER_COLOR = QColor("red")
+MARGIN = 30
+
+
+class ScoreChart(QWidget):
+    # points kept per curve, halved whenever it fills up
+    MAX_POINTS = 2048
+
+    def __init__(self, parent=None) -> None:
+        """
+        cumulative hider and seeker scores of a streaming simulation,
+        keeping a bounded number of points however long the run gets
+        """
+        super().__init__(parent)
+        self.points = np.zeros((self.MAX_POINTS, 3))
+        self.count = 0
+
+    def sizeHint(self) -> QSize:
+        return QSize(320, 160)
+
+    def clear(self) -> None:
+        self.count = 0
+        self.update()
+
+    def add_points(self, rounds, hider_score, seeker_score) -> None:
+        """
+        :param rounds: round number of every point
+        :param hider_score: cumulative hider score at those rounds
+        :param seeker_score: cumulative seeker score at those rounds
+        """
+        new = np.column_stack([rounds, hider_score, seeker_score])
+        while self.count + len(new) > self.MAX_POINTS:
+            # keep every other point, always including the latest one
+            if self.count:
+                kept = self.points[self.count - 1::-2][::-1]
+                self.count = len(kept)
+                self.points[:self.count] = kept
+            if len(new) > self.MAX_POINTS // 2:
+                new = new[len(new) - 1::-2][::-1]
+        self.points[self.count:self.count + len(new)] = new
+        self.count += len(new)
+        self.update()
+
+    def paintEvent(self, event) -> None:
+        painter = QPainter(self)
+        plot = QRectF(self.rect()).adjusted(MARGIN, 10, -10, -MARGIN)
+        painter.drawRect(plot)
+        painter.drawText(QRectF(plot.left(), plot.bottom() + 5, plot.width(), 20),
+                         Qt.AlignmentFlag.AlignCenter, "rounds")
+        if self.count < 2:
+            painter.end()
+            return
+
+        points = self.points[:self.count]
+        x_max = max(points[:, 0].max(), 1.0)
+        y_min = min(points[:, 1:].min(), 0.0)
+        y_max = max(points[:, 1:].max(), y_min + 1e-9)
+        xs = plot.left() + points[:, 0] / x_max * plot.width()
+        for column, color, label in ((1, HIDER_COLOR, "hider"), (2, SEEKER_COLOR, "seeker")):
+            ys = plot.bottom() - (points[:, column] - y_min) / (y_max - y_min) * plot.height()
+            painter.setPen(QPen(color, 2))
+            painter.drawPolyline(QPolygonF([QPointF(x, y) for x, y in zip(xs, ys)]))
+            painter.drawText(QPointF(plot.left() + 5, plot.top() + 15 * column),
+                             f"{label}: {points[-1, column]:g}")
+        painter.setPen(QColor("black"))
+        painter.drawText(QPointF(plot.right() - 80, plot.bottom() + 20), f"{x_max:,.0f}")
+        painter.end()
+
+
+class FrequencyBars(QWidget):
+    def __init__(self, parent=None) -> None:
+        """
+        empirical choice frequency of every location against its
+        equilibrium probability, hider on top and seeker below; only the
+        per-location counts are kept
+        """
+        super().__init__(parent)
+        self.equilibrium = np.zeros((2, 0))
+        self.counts = np.zeros((2, 0), dtype=np.int64)
+
+    def sizeHint(self) -> QSize:
+        return QSize(320, 160)
+
+    def set_equilibrium(self, hider, seeker) -> None:
+        self.equilibrium = np.vstack([hider, seeker])
+        self.counts = np.zeros(self.equilibrium.shape, dtype=np.int64)
+        self.update()
+
+    def add_choices(self, hider_choices, seeker_choices) -> None:
+        size = self.counts.shape[1]
+        self.counts[0] += np.bincount(hider_choices, minlength=size)
+        self.counts[1] += np.bincount(seeker_choices, minlength=size)
+        self.update()
+
+    def paintEvent(self, event) -> None:
+        painter = QPainter(self)
+        size = self.counts.shape[1]
+        if size == 0:
+            painter.end()
+            return
+        totals = np.maximum(self.counts.sum(axis=1, keepdims=True), 1)
+        frequencies = self.counts / totals
+        top = max(frequencies.max(), self.equilibrium.max(), 1e-9)
+
+        area = QRectF(self.rect()).adjusted(MARGIN, 5, -10, -5)
+        height = area.height() / 2
+        width = area.width() / size
+        for row, (color, label) in enumerate(((HIDER_COLOR, "hider"), (SEEKER_COLOR, "seeker"))):
+            bottom = area.top() + height * (row + 1) - 4
+            painter.setPen(QColor("black"))
+            painter.drawText(QPointF(area.left() - MARGIN + 2, bottom - height / 2), label[0].upper())
+            for i in range(size):
+                bar = frequencies[row, i] / top * (height - 8)
+                painter.fillRect(QRectF(area.left() + i * width, bottom - bar, max(width - 1, 1), bar), color)
+                # equilibrium probability as a black tick over the bar
+                tick = bottom - self.equilibrium[row, i] / top * (height - 8)
+                painter.drawLine(QPointF(area.left() + i * width, tick),
+                                 QPointF(area.left() + (i + 1) * width - 1, tick))
+        painter.end()
@@ -0,0 +1,145 @@
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+from StructuredPayoff import StructuredPayoff
+
+
+def cache_key(matrix, **params) -> str:
+    """
+    content hash of a payoff matrix and the solver settings used on it
+
+    :param matrix: dense matrix or StructuredPayoff
+    :param params: anything else the result depends on, e.g. the method
+    :return: hex digest
+    """
+    digest = hashlib.sha256()
+    if isinstance(matrix, StructuredPayoff):
+        correction = matrix.correction.copy()
+        correction.sum_duplicates()
+        correction.sort_indices()
+        arrays = [matrix.base, correction.data, correction.indices, correction.indptr]
+        digest.update(b"structured")
+    else:
+        arrays = [np.asarray(matrix, dtype=float)]
+        digest.update(b"dense")
+    for array in arrays:
+        array = np.ascontiguousarray(array)
+        digest.update(str((array.shape, array.dtype.str)).encode())
+        digest.update(array.tobytes())
+    digest.update(repr(sorted(params.items())).encode())
+    return digest.hexdigest()
+
+
+class EquilibriumCache:
+    def __init__(self, max_entries: int = 256, directory: str | None = None,
+                 max_disk_bytes: int = 256 * 2 ** 20) -> None:
+        """
+        two tier cache of solve_zero_sum_game results: an in-memory LRU and
+        an optional directory of .npz files, evicted least recently used
+        first once it grows past max_disk_bytes
+
+        :param max_entries: results kept in memory
+        :param directory: where to keep results on disk, memory only if None
+        :param max_disk_bytes: size limit of the directory
+        """
+        self.max_entries = max_entries
+        self.directory = directory
+        self.max_disk_bytes = max_disk_bytes
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self._memory = OrderedDict()
+        # PayoffMatrix may be built on worker threads, e.g. by the GUI
+        self._lock = threading.RLock()
+        if directory is not None:
+            os.makedirs(directory, exist_ok=True)
+
+    def __len__(self) -> int:
+        return len(self._memory)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.npz")
+
+    def get(self, key: str) -> dict | None:
+        """
+        :param key: from cache_key
+        :return: a copy of the cached result, None on a miss
+        """
+        with self._lock:
+            return self._get(key)
+
+    def _get(self, key: str) -> dict | None:
+        if key in self._memory:
+            self._memory.move_to_end(key)
+            self.hits += 1
+            return _copy(self._memory[key])
+
+        if self.directory is not None and os.path.exists(self._path(key)):
+            with np.load(self._path(key)) as stored:
+                result = {name: stored[name] if stored[name].ndim else stored[name].item() for name in stored.files}
+            os.utime(self._path(key))
+            self._remember(key, result)
+            self.hits += 1
+            self.disk_hits += 1
+            return _copy(result)
+
+        self.misses += 1
+        return None
+
+    def put(self, key: str, result: dict) -> None:
+        """
+        :param key: from cache_key
+        :param result: solve_zero_sum_game result to store
+        """
+        result = _copy(result)
+        with self._lock:
+            self._put(key, result)
+
+    def _put(self, key: str, result: dict) -> None:
+        self._remember(key, result)
+        if self.directory is not None:
+            # write then rename so readers never see a half written file
+            temporary = self._path(key) + f".{os.getpid()}.tmp"
+            with open(temporary, "wb") as f:
+                np.savez(f, **{name: np.asarray(value) for name, value in result.items()})
+            os.replace(temporary, self._path(key))
+            self._evict_disk()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._memory.clear()
+        self.hits = self.disk_hits = self.misses = 0
+
+    def stats(self) -> dict:
+        return {"hits": self.hits, "disk_hits": self.disk_hits, "misses": self.misses, "entries": len(self)}
+
+    def _remember(self, key: str, result: dict) -> None:
+        self._memory[key] = result
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def _evict_disk(self) -> None:
+        entries = []
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith(".npz"):
+                info = entry.stat()
+                entries.append((info.st_mtime, info.st_size, entry.path))
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_disk_bytes:
+                break
+            os.remove(path)
+            total -= size
+
+
+def _copy(result: dict) -> dict:
+    return {name: value.copy() if isinstance(value, np.ndarray) else value for name, value in result.items()}
+
+
+# shared by every PayoffMatrix unless told otherwise
+DEFAULT_CACHE = EquilibriumCache()
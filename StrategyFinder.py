@@ -1,23 +1,153 @@
 from typing import List
 
 import numpy as np
-from scipy.optimize import linprog
 
+from Instrumentation import count, span
+from IterativeSolvers import SOLVERS as ITERATIVE_SOLVERS
+from StructuredPayoff import StructuredPayoff
 
-def solve_zero_sum_game(matrix: list[list[int]]) -> dict:
+LP_METHODS = ("dual", "two_lp")
+
+
+def solve_zero_sum_game(matrix: list[list[int]], method: str = "dual", **options) -> dict:
     """
     Solves a two-player zero-sum game using linear programming.
     Returns optimal strategies for Player A (x), Player B (y), and game value (v).
 
     Args:
-        matrix : The m x n payoff matrix from Player A's perspective.
+        matrix : The m x n payoff matrix from Player A's perspective,
+            either dense or a StructuredPayoff.
+        method : "dual" solves Player A's LP once with HiGHS and reads
+            Player B's strategy from its constraint marginals, "two_lp"
+            solves both players' LPs separately. "fictitious_play", "hedge"
+            and "rm_plus" run the iterative solvers from IterativeSolvers
+            instead, which never build the LP.
+        **options : Passed to the iterative solver (tol, max_iter, callback),
+            not accepted by the LP methods.
 
     Returns:
         dict: Optimal strategies and game value.
     """
-    payoff_matrix = np.array(matrix)
+    if method not in LP_METHODS and method not in ITERATIVE_SOLVERS:
+        raise ValueError(f"Unknown method: {method}")
+    if method in LP_METHODS and options:
+        raise TypeError(f"Method {method!r} takes no options, got {sorted(options)}")
+
+    if method in ITERATIVE_SOLVERS:
+        if not isinstance(matrix, StructuredPayoff):
+            matrix = np.asarray(matrix, dtype=float)
+        with span(method, shape=matrix.shape) as s:
+            result = ITERATIVE_SOLVERS[method](matrix, **options)
+            s.set(iterations=result['Iterations'], exploitability=result['Exploitability'])
+        return result
+
+    if isinstance(matrix, StructuredPayoff):
+        payoff_matrix = matrix
+        hider_lp, seeker_lp = _structured_lps, _structured_seeker_lp
+    else:
+        payoff_matrix = np.array(matrix)
+        hider_lp, seeker_lp = _dense_lps, _dense_seeker_lp
     m, n = payoff_matrix.shape  # m = Player A's strategies, n = Player B's strategies
 
+    with span("LP setup", shape=payoff_matrix.shape):
+        lp = hider_lp(payoff_matrix)
+    res_A = _linprog(lp)
+    x = res_A.x[:m]
+    v_A = res_A.x[-1]
+
+    if method == "dual":
+        # The marginals of -A^T x + v <= 0 are -y, Player B's optimal strategy
+        y = np.clip(-res_A.ineqlin.marginals, 0, None)
+        y /= y.sum()
+        # Duality gap: Player A's best response to y can't beat v
+        v_B = np.max(payoff_matrix @ y)
+    else:
+        with span("LP setup", shape=payoff_matrix.shape):
+            lp = seeker_lp(payoff_matrix)
+        res_B = _linprog(lp)
+        y = res_B.x[:-1]
+        v_B = res_B.x[-1]
+
+    assert np.isclose(v_A, v_B), "Game values for Players A and B do not match!"
+
+    return {
+        'Hider': x,
+        'Seeker': y,
+        'Game value (v)': v_A
+    }
+
+
+def solve_warm(matrix, hider_support, seeker_support, method: str = "dual",
+               tol: float = 1e-9, batch: int = 8) -> dict:
+    """
+    Solves a zero-sum game by double oracle: solve the game restricted to
+    a few strategies, add the best responses that beat it, repeat. Seeding
+    the restricted game with the supports of a previous equilibrium makes
+    re-solving a slightly changed game much cheaper than a cold solve,
+    and the result is still an exact equilibrium of the full game.
+
+    Args:
+        matrix : The m x n payoff matrix from Player A's perspective,
+            dense or a StructuredPayoff.
+        hider_support : Rows to start from, e.g. the previous Hider support.
+        seeker_support : Columns to start from.
+        method : LP method used on the restricted games.
+        tol : Best responses must improve on the value by more than this.
+        batch : At most this many rows and columns are added per iteration.
+
+    Returns:
+        dict: Optimal strategies and game value.
+    """
+    if not isinstance(matrix, StructuredPayoff):
+        matrix = np.asarray(matrix, dtype=float)
+    m, n = matrix.shape
+    rows = list(dict.fromkeys(int(i) for i in hider_support)) or [0]
+    cols = list(dict.fromkeys(int(j) for j in seeker_support)) or [0]
+
+    while True:
+        if isinstance(matrix, StructuredPayoff):
+            block = matrix.submatrix(rows, cols)
+        else:
+            block = matrix[np.ix_(rows, cols)]
+        result = solve_zero_sum_game(block, method)
+        v = result['Game value (v)']
+        x = np.zeros(m)
+        y = np.zeros(n)
+        x[rows] = result['Hider']
+        y[cols] = result['Seeker']
+
+        # Best responses of each player against the restricted equilibrium
+        row_values = matrix @ y
+        col_values = x @ matrix
+        new_rows = [i for i in np.argsort(-row_values)[:batch] if row_values[i] > v + tol and i not in rows]
+        new_cols = [j for j in np.argsort(col_values)[:batch] if col_values[j] < v - tol and j not in cols]
+        if not new_rows and not new_cols:
+            return {
+                'Hider': x,
+                'Seeker': y,
+                'Game value (v)': v
+            }
+        rows += [int(i) for i in new_rows]
+        cols += [int(j) for j in new_cols]
+
+
+def _linprog(lp: dict):
+    # scipy.optimize is slow to import, only pay for it on the first solve
+    from scipy.optimize import linprog
+
+    with span("linprog", variables=len(lp["c"])) as s:
+        res = linprog(**lp, method="highs")
+        s.set(status=res.status, nit=res.get("nit"))
+    count("linprog.calls")
+    count("linprog.iterations", res.get("nit", 0))
+    if not res.success:
+        raise RuntimeError(f"linprog failed with status {res.status}: {res.message}")
+    return res
+
+
+def _dense_lps(payoff_matrix: np.ndarray) -> dict:
+    m, n = payoff_matrix.shape
+
     # --- Player A's LP: Maximize v (subject to A^T x >= v, sum(x) = 1, x >= 0) ---
     # Rewrite as: -A^T x + v <= 0, sum(x) = 1
     c_A = np.zeros(m + 1)
@@ -29,9 +159,11 @@ def solve_zero_sum_game(matrix: list[list[int]]) -> dict:
     b_eq_A = np.array([1.0])
     bounds_A = [(0, None) for _ in range(m)] + [(None, None)]  # x >= 0, v unbounded
 
-    res_A = linprog(c=c_A, A_ub=A_ub_A, b_ub=b_ub_A, A_eq=A_eq_A, b_eq=b_eq_A, bounds=bounds_A)
-    x = res_A.x[:-1]
-    v_A = res_A.x[-1]
+    return dict(c=c_A, A_ub=A_ub_A, b_ub=b_ub_A, A_eq=A_eq_A, b_eq=b_eq_A, bounds=bounds_A)
+
+
+def _dense_seeker_lp(payoff_matrix: np.ndarray) -> dict:
+    m, n = payoff_matrix.shape
 
     # --- Player B's LP: Minimize v (subject to A y <= v, sum(y) = 1, y >= 0) ---
     c_B = np.zeros(n + 1)
@@ -43,17 +175,53 @@ def solve_zero_sum_game(matrix: list[list[int]]) -> dict:
     b_eq_B = np.array([1.0])
     bounds_B = [(0, None) for _ in range(n)] + [(None, None)]  # y >= 0, v unbounded
 
-    res_B = linprog(c=c_B, A_ub=A_ub_B, b_ub=b_ub_B, A_eq=A_eq_B, b_eq=b_eq_B, bounds=bounds_B)
-    y = res_B.x[:-1]
-    v_B = res_B.x[-1]
+    return dict(c=c_B, A_ub=A_ub_B, b_ub=b_ub_B, A_eq=A_eq_B, b_eq=b_eq_B, bounds=bounds_B)
 
-    assert np.isclose(v_A, v_B), "Game values for Players A and B do not match!"
 
-    return {
-        'Hider': x,
-        'Seeker': y,
-        'Game value (v)': v_A
-    }
+def _structured_lps(matrix: StructuredPayoff) -> dict:
+    """
+    Player A's LP written against base + correction so the constraint
+    matrix stays sparse. Variables are x, s = base . x and v.
+    """
+    from scipy import sparse
+
+    base = matrix.base
+    correction = matrix.correction
+    m, n = matrix.shape
+
+    # --- Player A's LP: (A^T x)_j = s + (C^T x)_j ---
+    # Rewrite as: -s - C^T x + v <= 0, sum(x) = 1, base . x - s = 0
+    c_A = np.zeros(m + 2)
+    c_A[-1] = -1
+
+    A_ub_A = sparse.hstack([-correction.T, np.full((n, 1), -1.0), np.ones((n, 1))], format="csr")
+    b_ub_A = np.zeros(n)
+    A_eq_A = np.vstack([np.append(np.ones(m), [0, 0]), np.append(base, [-1, 0])])
+    b_eq_A = np.array([1.0, 0.0])
+    bounds_A = [(0, None) for _ in range(m)] + [(None, None), (None, None)]
+
+    return dict(c=c_A, A_ub=A_ub_A, b_ub=b_ub_A, A_eq=A_eq_A, b_eq=b_eq_A, bounds=bounds_A)
+
+
+def _structured_seeker_lp(matrix: StructuredPayoff) -> dict:
+    from scipy import sparse
+
+    base = matrix.base
+    correction = matrix.correction
+    m, n = matrix.shape
+
+    # --- Player B's LP: (A y)_i = base_i + (C y)_i since sum(y) = 1 ---
+    # Rewrite as: C y - v <= -base, sum(y) = 1
+    c_B = np.zeros(n + 1)
+    c_B[-1] = 1
+
+    A_ub_B = sparse.hstack([correction, np.full((m, 1), -1.0)], format="csr")
+    b_ub_B = -base
+    A_eq_B = np.append(np.ones(n), 0).reshape(1, -1)
+    b_eq_B = np.array([1.0])
+    bounds_B = [(0, None) for _ in range(n)] + [(None, None)]
+
+    return dict(c=c_B, A_ub=A_ub_B, b_ub=b_ub_B, A_eq=A_eq_B, b_eq=b_eq_B, bounds=bounds_B)
 
 
 def run_test_cases():
@@ -0,0 +1,124 @@
+import numpy as np
+
+
+class StructuredPayoff:
+    # make `x @ matrix` with an ndarray x defer to __rmatmul__ instead of
+    # numpy converting the matrix row by row
+    __array_ufunc__ = None
+
+    def __init__(self, base, correction) -> None:
+        """
+        payoff matrix stored as a row base value plus a sparse correction,
+        i.e. matrix[i][j] = base[i] + correction[i, j]
+
+        in a hide and seek world every entry away from the diagonal and the
+        neighbour rings only depends on the hider's location type, so this
+        takes memory linear in the number of locations instead of quadratic
+
+        :param base: value every entry of row i takes by default
+        :param correction: sparse (size x size) matrix added on top of base
+        """
+        from scipy import sparse
+
+        self.base = np.asarray(base, dtype=float)
+        self.correction = sparse.csr_array(correction, dtype=float)
+        self._correction_t = self.correction.T.tocsr()
+        self.shape = self.correction.shape
+        self.size = self.shape[0]
+
+    def __len__(self) -> int:
+        return self.shape[0]
+
+    def __iter__(self):
+        for i in range(self.shape[0]):
+            yield self[i]
+
+    def _index(self, key):
+        """
+        normalise a row or column index the way ndarray does: negative ints
+        count from the end, slices and arrays become index arrays
+        """
+        size = self.shape[0]
+        if isinstance(key, (int, np.integer)):
+            index = int(key) + size if key < 0 else int(key)
+            if not 0 <= index < size:
+                raise IndexError(f"index {key} is out of bounds for size {size}")
+            return index
+        return np.arange(size)[key]
+
+    def __getitem__(self, key):
+        """
+        matrix[i] returns row i as a dense array (2D for slices and arrays),
+        matrix[i, j] returns a single entry, an array of entries when i and j
+        are arrays, or a dense block when either of them is a slice
+        """
+        if not isinstance(key, tuple):
+            rows = self._index(key)
+            if np.ndim(rows) == 0:
+                return self.base[rows] + self.correction[[rows]].toarray()[0]
+            return self.base[rows][:, None] + self.correction[rows].toarray()
+
+        i, j = key
+        rows, cols = self._index(i), self._index(j)
+        if np.ndim(rows) == 0 and np.ndim(cols) == 0:
+            return self.base[rows] + self.correction[rows, cols]
+        if (isinstance(i, slice) or isinstance(j, slice)) and np.ndim(rows) and np.ndim(cols):
+            rows, cols = np.ix_(rows, cols)
+        rows, cols = np.broadcast_arrays(rows, cols)
+        values = self.correction[rows.ravel(), cols.ravel()]
+        return (self.base[rows.ravel()] + values).reshape(rows.shape)
+
+    def __matmul__(self, y):
+        """
+        matrix @ y without building the dense matrix
+        """
+        y = np.asarray(y, dtype=float)
+        return self.base * y.sum() + self.correction @ y
+
+    def __rmatmul__(self, x):
+        """
+        x @ matrix without building the dense matrix
+        """
+        x = np.asarray(x, dtype=float)
+        return self.base @ x + self._correction_t @ x
+
+    @property
+    def nbytes(self) -> int:
+        c = self.correction
+        return self.base.nbytes + c.data.nbytes + c.indices.nbytes + c.indptr.nbytes
+
+    def row_columns(self, i: int) -> np.ndarray:
+        """
+        the columns row i has a correction on
+        """
+        c = self.correction
+        return c.indices[c.indptr[i]:c.indptr[i + 1]]
+
+    def set_row(self, i: int, base: float, values) -> None:
+        """
+        replace row i in place, keeping its sparsity pattern: base becomes
+        the row's default value and values the corrections on the columns
+        given by row_columns(i), in that order
+        """
+        c, t = self.correction, self._correction_t
+        start, stop = c.indptr[i], c.indptr[i + 1]
+        self.base[i] = base
+        c.data[start:stop] = values
+        # the transpose holds the same entries as column i
+        for j, value in zip(c.indices[start:stop], c.data[start:stop]):
+            k = t.indptr[j] + np.flatnonzero(t.indices[t.indptr[j]:t.indptr[j + 1]] == i)[0]
+            t.data[k] = value
+
+    def submatrix(self, rows, cols) -> "StructuredPayoff":
+        """
+        the rows x cols block, still structured (and possibly rectangular)
+        """
+        rows = self._index(rows)
+        cols = self._index(cols)
+        return StructuredPayoff(self.base[rows], self.correction[rows][:, cols])
+
+    def toarray(self) -> np.ndarray:
+        """
+        materialise the dense matrix, only meant for small worlds
+        """
+        return self.base[:, None] + self.correction.toarray()
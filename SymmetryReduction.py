@@ -0,0 +1,172 @@
+import numpy as np
+
+from StrategyFinder import solve_zero_sum_game
+from StructuredPayoff import StructuredPayoff
+
+
+def grid_symmetries(location_type, n: int, m: int) -> list[np.ndarray]:
+    """
+    Finds the reflections and rotations of the n x m grid that map every
+    location onto one of the same type. The payoff only depends on the
+    location types and on axis-aligned distances, so each of these
+    permutations p satisfies A[p[i]][p[j]] == A[i][j].
+
+    Translations are not symmetries of a bounded grid: they move the
+    neighbour rings of the border locations off the grid, so they are
+    never considered.
+
+    Args:
+        location_type : Type of every location, row-major.
+        n : Number of rows.
+        m : Number of columns.
+
+    Returns:
+        list: Index permutations forming a group, identity included.
+    """
+    types = np.asarray(location_type)
+    rows, cols = np.divmod(np.arange(n * m), m)
+    candidates = [
+        (rows, cols),
+        (n - 1 - rows, cols),
+        (rows, m - 1 - cols),
+        (n - 1 - rows, m - 1 - cols),
+    ]
+    if n == m:
+        candidates += [
+            (cols, rows),
+            (m - 1 - cols, n - 1 - rows),
+            (cols, n - 1 - rows),
+            (m - 1 - cols, rows),
+        ]
+
+    symmetries = []
+    for new_rows, new_cols in candidates:
+        permutation = new_rows * m + new_cols
+        if np.array_equal(types[permutation], types):
+            symmetries.append(permutation)
+    return symmetries
+
+
+def orbits(symmetries: list[np.ndarray]) -> np.ndarray:
+    """
+    Labels every location with the index of its equivalence class under
+    the given group of permutations.
+
+    Args:
+        symmetries : Permutations forming a group.
+
+    Returns:
+        np.ndarray: Class label of every location, labels are 0..k-1.
+    """
+    smallest = np.min(np.stack(symmetries), axis=0)
+    _, labels = np.unique(smallest, return_inverse=True)
+    return labels
+
+
+def quotient_game(matrix, labels: np.ndarray):
+    """
+    Builds the game where each player picks an equivalence class and then
+    a uniformly random location inside it:
+    B[I][J] = sum over j in J of A[r_I][j] / |J| for a representative r_I of I.
+
+    Args:
+        matrix : Payoff matrix, ndarray or StructuredPayoff, invariant
+            under the permutations the labels come from.
+        labels : Class label of every location.
+
+    Returns:
+        tuple: (B, class sizes), B has the type of matrix.
+    """
+    from scipy import sparse
+
+    size = len(labels)
+    k = labels.max() + 1
+    sizes = np.bincount(labels, minlength=k)
+    representatives = np.unique(labels, return_index=True)[1]
+    # averaging operator: column j of A goes to column labels[j], divided by its class size
+    average = sparse.csr_array((1 / sizes[labels], (np.arange(size), labels)), shape=(size, k))
+
+    if isinstance(matrix, StructuredPayoff):
+        correction = matrix.correction[representatives] @ average
+        return StructuredPayoff(matrix.base[representatives], correction), sizes
+    rows = np.asarray(matrix, dtype=float)[representatives]
+    return np.asarray((average.T @ rows.T).T), sizes
+
+
+def remove_dominated(matrix: np.ndarray):
+    """
+    Iteratively removes strictly dominated pure strategies: rows the
+    maximizing Player A never plays and columns the minimizing Player B
+    never plays.
+
+    Args:
+        matrix : Dense payoff matrix from Player A's perspective.
+
+    Returns:
+        tuple: (reduced matrix, kept row indices, kept column indices).
+    """
+    rows = np.arange(matrix.shape[0])
+    cols = np.arange(matrix.shape[1])
+    changed = True
+    while changed:
+        changed = False
+        block = matrix[np.ix_(rows, cols)]
+        keep = [not np.any(np.all(block > block[i], axis=1)) for i in range(len(rows))]
+        if not all(keep):
+            rows = rows[keep]
+            changed = True
+            block = block[keep]
+        keep = [not np.any(np.all(block < block[:, [j]], axis=0)) for j in range(len(cols))]
+        if not all(keep):
+            cols = cols[keep]
+            changed = True
+    return matrix[np.ix_(rows, cols)], rows, cols
+
+
+def solve_reduced(matrix, location_type, n: int, m: int, method: str = "dual",
+                  max_dominance_size: int = 150, **options) -> dict:
+    """
+    Solves a hide and seek world through its symmetry quotient with
+    strictly dominated strategies removed, then expands the strategies
+    back to every location. Strategies are spread uniformly inside each
+    equivalence class, which is an equilibrium of the full game since the
+    payoff is invariant under the symmetries.
+
+    Args:
+        matrix : Payoff matrix of the world, ndarray or StructuredPayoff.
+        location_type : Type of every location, row-major.
+        n : Number of rows.
+        m : Number of columns.
+        method : Solver passed on to solve_zero_sum_game.
+        max_dominance_size : Skip the dominance pass on quotients with
+            more classes than this, it costs O(k^3).
+        **options : Passed on to solve_zero_sum_game.
+
+    Returns:
+        dict: Optimal strategies over all locations and game value.
+    """
+    labels = orbits(grid_symmetries(location_type, n, m))
+    k = labels.max() + 1
+    if k < n * m:
+        game, sizes = quotient_game(matrix, labels)
+    else:
+        game, sizes = matrix, np.ones(k, dtype=int)
+
+    rows = cols = np.arange(k)
+    if k <= max_dominance_size:
+        dense = game.toarray() if isinstance(game, StructuredPayoff) else np.asarray(game, dtype=float)
+        reduced, rows, cols = remove_dominated(dense)
+        if len(rows) < k or len(cols) < k:
+            game = reduced
+
+    result = solve_zero_sum_game(game, method, **options)
+    x = np.zeros(k)
+    y = np.zeros(k)
+    x[rows] = result['Hider']
+    y[cols] = result['Seeker']
+
+    return {
+        **result,
+        'Hider': x[labels] / sizes[labels],
+        'Seeker': y[labels] / sizes[labels],
+    }
@@ -0,0 +1,158 @@
+import numpy as np
+from PyQt6.QtCore import QAbstractTableModel, QModelIndex, Qt
+from PyQt6.QtGui import QColor
+
+# heatmap end points, light enough to keep black text readable
+LOW_COLOR = (170, 200, 255)
+HIGH_COLOR = (255, 170, 160)
+
+
+def heat_color(value: float, low: float, high: float) -> QColor:
+    """
+    blend from LOW_COLOR at low to HIGH_COLOR at high
+    """
+    t = 0.5 if high <= low else min(max((value - low) / (high - low), 0.0), 1.0)
+    return QColor(*(round(a + (b - a) * t) for a, b in zip(LOW_COLOR, HIGH_COLOR)))
+
+
+class PayoffTableModel(QAbstractTableModel):
+    def __init__(self, matrix=None, parent=None) -> None:
+        """
+        read-only view of a payoff matrix, cells are only looked up and
+        formatted when the view asks for them, i.e. when they are visible
+
+        :param matrix: dense ndarray or StructuredPayoff
+        """
+        super().__init__(parent)
+        self.matrix = None
+        self.low = self.high = 0.0
+        self.set_matrix(matrix)
+
+    def set_matrix(self, matrix) -> None:
+        self.beginResetModel()
+        self.matrix = matrix
+        if matrix is None:
+            self.low = self.high = 0.0
+        elif hasattr(matrix, "correction"):
+            # every entry is either base[i] or base[i] + a stored correction
+            coo = matrix.correction.tocoo()
+            values = np.concatenate([matrix.base, matrix.base[coo.row] + coo.data])
+            self.low, self.high = float(values.min()), float(values.max())
+        else:
+            self.low, self.high = float(np.min(matrix)), float(np.max(matrix))
+        self.endResetModel()
+
+    def rowCount(self, parent=QModelIndex()) -> int:
+        return 0 if self.matrix is None or parent.isValid() else self.matrix.shape[0]
+
+    def columnCount(self, parent=QModelIndex()) -> int:
+        return 0 if self.matrix is None or parent.isValid() else self.matrix.shape[1]
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        if role == Qt.ItemDataRole.DisplayRole:
+            return f"{self.matrix[index.row(), index.column()]:g}"
+        if role == Qt.ItemDataRole.BackgroundRole:
+            return heat_color(self.matrix[index.row(), index.column()], self.low, self.high)
+        return None
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if role == Qt.ItemDataRole.DisplayRole:
+            return str(section)
+        return None
+
+
+class ProbabilityTableModel(QAbstractTableModel):
+    ROWS = ("Hider", "Seeker")
+
+    def __init__(self, probability: dict | None = None, parent=None) -> None:
+        """
+        equilibrium strategies of both players, one row each
+
+        :param probability: solve_zero_sum_game result
+        """
+        super().__init__(parent)
+        self.strategies = None
+        self.high = 0.0
+        self.set_probability(probability)
+
+    def set_probability(self, probability: dict | None) -> None:
+        self.beginResetModel()
+        if probability is None:
+            self.strategies = None
+        else:
+            self.strategies = np.vstack([probability[name] for name in self.ROWS])
+            self.high = float(self.strategies.max())
+        self.endResetModel()
+
+    def rowCount(self, parent=QModelIndex()) -> int:
+        return 0 if self.strategies is None or parent.isValid() else 2
+
+    def columnCount(self, parent=QModelIndex()) -> int:
+        return 0 if self.strategies is None or parent.isValid() else self.strategies.shape[1]
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        if role == Qt.ItemDataRole.DisplayRole:
+            return f"{self.strategies[index.row(), index.column()]:.4f}"
+        if role == Qt.ItemDataRole.BackgroundRole:
+            return heat_color(self.strategies[index.row(), index.column()], 0.0, self.high)
+        return None
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if role != Qt.ItemDataRole.DisplayRole:
+            return None
+        if orientation == Qt.Orientation.Vertical:
+            return self.ROWS[section]
+        return str(section)
+
+
+class ChoicesTableModel(QAbstractTableModel):
+    COLUMNS = ("Hider", "Seeker")
+
+    def __init__(self, parent=None) -> None:
+        """
+        history of hider and seeker choices, kept in growable int arrays
+        """
+        super().__init__(parent)
+        self.choices = np.zeros((16, 2), dtype=np.int64)
+        self.length = 0
+
+    def clear(self) -> None:
+        self.set_choices(np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64))
+
+    def set_choices(self, hider_choices, seeker_choices) -> None:
+        self.beginResetModel()
+        self.choices = np.column_stack([hider_choices, seeker_choices]).astype(np.int64)
+        self.length = len(self.choices)
+        self.endResetModel()
+
+    def append(self, hider_choice: int, seeker_choice: int) -> None:
+        if self.length == len(self.choices):
+            grown = np.zeros((max(16, 2 * len(self.choices)), 2), dtype=np.int64)
+            grown[:self.length] = self.choices[:self.length]
+            self.choices = grown
+        self.beginInsertRows(QModelIndex(), self.length, self.length)
+        self.choices[self.length] = hider_choice, seeker_choice
+        self.length += 1
+        self.endInsertRows()
+
+    def rowCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else self.length
+
+    def columnCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else 2
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if index.isValid() and role == Qt.ItemDataRole.DisplayRole:
+            return str(self.choices[index.row(), index.column()])
+        return None
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if role != Qt.ItemDataRole.DisplayRole:
+            return None
+        if orientation == Qt.Orientation.Horizontal:
+            return self.COLUMNS[section]
+        return str(section)
@@ -0,0 +1,105 @@
+import argparse
+import csv
+import multiprocessing
+import os
+import time
+
+import numpy as np
+
+from GameInterface import GameInterface
+from PayoffMatrix import PayoffMatrix
+
+FIELDS = [
+    "world", "n", "m", "rounds", "game_value", "empirical_value",
+    "hider_score", "seeker_score", "solve_seconds", "simulate_seconds",
+]
+
+
+def play_world(task: tuple) -> dict:
+    """
+    build, solve and simulate a single world
+
+    :param task: (world id, n, m, rounds, seed sequence of this world)
+    :return: one result row
+    """
+    world, n, m, rounds, seed = task
+    rng = np.random.default_rng(seed)
+
+    start = time.perf_counter()
+    payoff = PayoffMatrix(n, m, rng=rng)
+    solved = time.perf_counter()
+    seeker_score, hider_score, _, _ = GameInterface(payoff, 0).simulate(rounds, rng)
+    simulated = time.perf_counter()
+
+    return {
+        "world": world,
+        "n": n,
+        "m": m,
+        "rounds": rounds,
+        "game_value": payoff.probability['Game value (v)'],
+        "empirical_value": (hider_score[-1] - seeker_score[-1]) / rounds,
+        "hider_score": hider_score[-1],
+        "seeker_score": seeker_score[-1],
+        "solve_seconds": solved - start,
+        "simulate_seconds": simulated - solved,
+    }
+
+
+def make_tasks(worlds: int, n_range: tuple, m_range: tuple, rounds: int, seed: int) -> list[tuple]:
+    """
+    draw the size of every world and give each one its own seed sequence,
+    so results do not depend on which worker plays which world
+
+    :param worlds: number of worlds
+    :param n_range: inclusive (low, high) range of rows
+    :param m_range: inclusive (low, high) range of columns
+    :param rounds: rounds simulated per world
+    :param seed: master seed
+    :return: tasks for play_world
+    """
+    root = np.random.SeedSequence(seed)
+    size_seed, *world_seeds = root.spawn(worlds + 1)
+    sizes = np.random.default_rng(size_seed)
+    ns = sizes.integers(n_range[0], n_range[1] + 1, worlds)
+    ms = sizes.integers(m_range[0], m_range[1] + 1, worlds)
+    return [(i, int(ns[i]), int(ms[i]), rounds, world_seeds[i]) for i in range(worlds)]
+
+
+def run_tournament(tasks: list[tuple], output: str, workers: int | None = None, chunksize: int = 4):
+    """
+    play every task across a process pool, appending each result to a
+    CSV file as soon as it is done
+
+    :param tasks: tasks from make_tasks
+    :param output: path of the CSV file to write
+    :param workers: number of processes, all cores if None
+    :param chunksize: tasks handed to a worker at once
+    :return: number of worlds played
+    """
+    played = 0
+    with open(output, "w", newline="") as f, multiprocessing.Pool(workers) as pool:
+        writer = csv.DictWriter(f, fieldnames=FIELDS)
+        writer.writeheader()
+        for row in pool.imap_unordered(play_world, tasks, chunksize=chunksize):
+            writer.writerow(row)
+            f.flush()
+            played += 1
+    return played
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Solve and simulate many random hide and seek worlds.")
+    parser.add_argument("--worlds", type=int, default=1000)
+    parser.add_argument("--n-range", type=int, nargs=2, default=(1, 8), metavar=("LOW", "HIGH"))
+    parser.add_argument("--m-range", type=int, nargs=2, default=(1, 8), metavar=("LOW", "HIGH"))
+    parser.add_argument("--rounds", type=int, default=10000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--output", default="tournament.csv")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    tasks = make_tasks(args.worlds, args.n_range, args.m_range, args.rounds, args.seed)
+    played = run_tournament(tasks, args.output, args.workers)
+    elapsed = time.perf_counter() - start
+    print(f"{played} worlds in {elapsed:.2f}s ({played / elapsed:.1f} worlds/s) -> {args.output}")
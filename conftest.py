@@ -0,0 +1,16 @@
+import importlib.util
+import os
+
+import pytest
+
+# the GUI tests render offscreen, and are skipped where PyQt6 isn't installed
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+if importlib.util.find_spec("PyQt6") is None:
+    collect_ignore = ["test_gui.py", "test_place_grid.py", "test_simulation_charts.py", "test_table_models.py"]
+
+
+@pytest.fixture(scope="session")
+def app():
+    from PyQt6.QtWidgets import QApplication
+
+    return QApplication.instance() or QApplication([])
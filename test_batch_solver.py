@@ -0,0 +1,51 @@
+import numpy as np
+import pytest
+
+from BatchSolver import solve_batch
+from PayoffMatrix import build_matrix
+from StrategyFinder import solve_zero_sum_game
+
+
+def check_equilibria(matrices, result):
+    for A, x, y, v in zip(matrices, result['Hider'], result['Seeker'], result['Game value (v)']):
+        assert x.sum() == pytest.approx(1) and y.sum() == pytest.approx(1)
+        assert (x >= -1e-12).all() and (y >= -1e-12).all()
+        assert np.min(x @ A) == pytest.approx(v)
+        assert np.max(A @ y) == pytest.approx(v)
+        assert v == pytest.approx(solve_zero_sum_game(A)['Game value (v)'])
+
+
+@pytest.mark.parametrize("n, m", [(1, 2), (1, 3), (1, 8), (2, 2), (2, 3), (3, 3)])
+def test_worlds_match_the_lp(n, m):
+    rng = np.random.default_rng(n * 10 + m)
+    matrices = np.stack([build_matrix(rng.integers(1, 4, n * m), n, m) for _ in range(60)])
+    result = solve_batch(matrices)
+    assert not result['LP'].any()
+    check_equilibria(matrices, result)
+
+
+@pytest.mark.parametrize("shape", [(2, 2), (3, 5), (6, 4)])
+def test_random_games_match_the_lp(shape):
+    matrices = np.random.default_rng(0).normal(size=(40,) + shape)
+    result = solve_batch(matrices)
+    assert not result['LP'].any()
+    check_equilibria(matrices, result)
+
+
+def test_saddle_points_and_degenerate_games():
+    matrices = np.array([
+        [[3.0, 1.0], [4.0, 2.0]],    # saddle at (1, 1)
+        [[1.0, 1.0], [1.0, 1.0]],    # every pair is an equilibrium
+        [[0.0, 1.0], [1.0, 0.0]],    # matching pennies
+    ])
+    result = solve_batch(matrices)
+    assert result['Game value (v)'] == pytest.approx([2, 1, 0.5])
+    assert result['Hider'][0] == pytest.approx([0, 1])
+    check_equilibria(matrices, result)
+
+
+def test_unfinished_games_fall_back_to_the_lp():
+    matrices = np.random.default_rng(1).normal(size=(10, 5, 5))
+    result = solve_batch(matrices, max_iter=1)
+    assert result['LP'].any()
+    check_equilibria(matrices, result)
@@ -0,0 +1,48 @@
+import json
+
+import numpy as np
+
+from Benchmark import compare, load_baseline, main, measure, run_suite, save_baseline, suite
+
+
+def test_measure_reports_time_and_peak_memory():
+    result = measure(np.ones, 10**6, repeat=1)
+    assert result["time"] > 0
+    assert result["peak"] >= 8 * 10**6
+
+
+def test_suite_covers_build_solve_and_simulate():
+    results = run_suite(suite(worlds=[(1, 4), (3, 3)], rounds=[100]), repeat=1)
+    assert set(results) == {"build/1x4", "build/3x3", "solve/1x4", "solve/3x3", "simulate/100"}
+
+
+def test_compare_flags_regressions():
+    baseline = {"a": {"time": 1.0, "peak": 100}, "b": {"time": 1.0, "peak": 100}, "c": {"time": 1e-4, "peak": 100}}
+    results = {
+        "a": {"time": 1.1, "peak": 105},
+        "b": {"time": 2.0, "peak": 200},
+        "c": {"time": 3e-4, "peak": 100},
+        "new": {"time": 5.0, "peak": 10**9},
+    }
+    regressions = compare(results, baseline)
+    assert len(regressions) == 2
+    assert all(message.startswith("b:") for message in regressions)
+
+
+def test_baseline_round_trip(tmp_path):
+    path = tmp_path / "baseline.json"
+    assert load_baseline(path) == {}
+    save_baseline({"a": {"time": 1.0, "peak": 2}}, path)
+    assert load_baseline(path) == {"a": {"time": 1.0, "peak": 2}}
+
+
+def test_main_fails_on_regression(tmp_path, capsys, monkeypatch):
+    monkeypatch.setattr("Benchmark.WORLDS", [(1, 4), (2, 2)])
+    monkeypatch.setattr("Benchmark.ROUNDS", [100, 1000])
+    path = tmp_path / "baseline.json"
+    path.write_text(json.dumps({"simulate/100": {"time": 1e-9, "peak": 1}}))
+    assert main(["--quick", "--baseline", str(path)]) == 1
+    assert "REGRESSION simulate/100: peak memory" in capsys.readouterr().out
+
+    assert main(["--quick", "--baseline", str(path), "--update-baseline"]) == 0
+    assert set(load_baseline(path)) == {"build/1x4", "solve/1x4", "simulate/100"}
@@ -0,0 +1,67 @@
+import numpy as np
+import pytest
+
+from GameInterface import GameInterface
+from PayoffMatrix import PayoffMatrix
+
+
+@pytest.fixture
+def payoff():
+    return PayoffMatrix(3, 3)
+
+
+def test_simulate_returns_arrays_and_is_reproducible(payoff):
+    interface = GameInterface(payoff, 0)
+    first = interface.simulate(1000, np.random.default_rng(7))
+    second = interface.simulate(1000, np.random.default_rng(7))
+    for a, b in zip(first, second):
+        assert isinstance(a, np.ndarray)
+        assert len(a) == 1000
+        assert np.array_equal(a, b)
+
+
+def test_simulate_scores_match_round_by_round(payoff):
+    seeker_score, hider_score, seeker_choices, hider_choices = GameInterface(payoff, 0).simulate(
+        500, np.random.default_rng(3))
+    seeker, hider = 0.0, 0.0
+    for i in range(500):
+        value = payoff.matrix[hider_choices[i], seeker_choices[i]]
+        if hider_choices[i] == seeker_choices[i]:
+            seeker -= value
+        else:
+            hider += value
+        assert seeker_score[i] == pytest.approx(seeker)
+        assert hider_score[i] == pytest.approx(hider)
+
+
+def test_simulate_converges_to_game_value(payoff):
+    rounds = 200000
+    seeker_score, hider_score, _, _ = GameInterface(payoff, 0).simulate(rounds, np.random.default_rng(0))
+    empirical = (hider_score[-1] - seeker_score[-1]) / rounds
+    assert empirical == pytest.approx(payoff.probability['Game value (v)'], abs=0.05)
+
+
+def test_simulate_stream_chunks_continue_scores(payoff):
+    interface = GameInterface(payoff, 0)
+    chunks = list(interface.simulate_stream(2500, chunk_size=1000, rng=np.random.default_rng(4)))
+    assert [len(chunk[0]) for chunk in chunks] == [1000, 1000, 500]
+
+    seeker_score, hider_score, seeker_choices, hider_choices = (np.concatenate(parts) for parts in zip(*chunks))
+    payoffs = payoff.matrix[hider_choices, seeker_choices]
+    found = hider_choices == seeker_choices
+    assert np.allclose(hider_score, np.cumsum(np.where(found, 0, payoffs)))
+    assert np.allclose(seeker_score, np.cumsum(np.where(found, -payoffs, 0)))
+
+
+def test_simulate_zero_rounds(payoff):
+    assert all(len(part) == 0 for part in GameInterface(payoff, 0).simulate(0))
+
+
+def test_equilibrium_opponent_keeps_dense_matrix(payoff, monkeypatch):
+    def fail(*args):
+        raise AssertionError("built a structured matrix for the equilibrium opponent")
+
+    monkeypatch.setattr("GameInterface.build_structured", fail)
+    GameInterface(payoff, 0)
+    with pytest.raises(AssertionError):
+        GameInterface(payoff, 0, opponent="frequency")
@@ -0,0 +1,61 @@
+import pytest
+from PyQt6.QtCore import QThreadPool
+
+from Gui import MainWindow
+
+
+@pytest.fixture
+def window(app):
+    window = MainWindow()
+    yield window
+    QThreadPool.globalInstance().waitForDone()
+    window.close()
+
+
+def wait_for_solve(app, window):
+    QThreadPool.globalInstance().waitForDone()
+    app.processEvents()
+
+
+def test_start_game_solves_in_background(app, window):
+    window.N.setValue(4)
+    window.start_game()
+    assert window.cancel_btn.isVisibleTo(window)
+    wait_for_solve(app, window)
+
+    assert window.payoff is not None
+    assert window.payoff.size == 4
+    assert not window.cancel_btn.isVisibleTo(window)
+
+
+def test_new_start_supersedes_running_solve(app, window):
+    window.N.setValue(3)
+    window.start_game()
+    window.N.setValue(5)
+    window.start_game()
+    wait_for_solve(app, window)
+
+    assert window.payoff.size == 5
+
+
+def test_cancel_drops_result(app, window):
+    window.start_game()
+    window.cancel_solve()
+    wait_for_solve(app, window)
+
+    assert window.payoff is None
+    assert not window.cancel_btn.isVisibleTo(window)
+
+
+def test_profile_covers_start_game_cycle(app, tmp_path):
+    import pstats
+
+    path = tmp_path / "start.prof"
+    window = MainWindow(str(path))
+    window.N.setValue(3)
+    window.start_game()
+    assert window.payoff.size == 3
+
+    functions = {func[2] for func in pstats.Stats(str(path)).stats}
+    assert {"initialize", "solve_finished", "update_tables"} <= functions
+    window.close()
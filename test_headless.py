@@ -0,0 +1,60 @@
+import os
+import subprocess
+import sys
+
+import numpy as np
+import pytest
+
+from GameInterface import GameInterface
+from Headless import main, play
+from PayoffMatrix import PayoffMatrix, build_matrix
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+
+def test_headless_does_not_import_qt():
+    code = "import sys, Headless; print(any(name.startswith('PyQt') for name in sys.modules))"
+    out = subprocess.run([sys.executable, "-c", code], cwd=HERE, capture_output=True, text=True, check=True)
+    assert out.stdout.strip() == "False"
+
+
+@pytest.mark.parametrize("stride", [1, 7, 1000])
+def test_play_keeps_every_stride_th_point(stride):
+    payoff = PayoffMatrix(2, 3, rng=np.random.default_rng(0), cache=None)
+    chunks = list(GameInterface(payoff, 0).simulate_stream(2500, 300, np.random.default_rng(1)))
+    full_seeker = np.concatenate([chunk[0] for chunk in chunks])
+    full_hider = np.concatenate([chunk[1] for chunk in chunks])
+    seeker, hider = play(payoff, 2500, np.random.default_rng(1), stride, chunk_size=300)
+    assert np.array_equal(seeker, full_seeker[stride - 1::stride])
+    assert np.array_equal(hider, full_hider[stride - 1::stride])
+
+
+@pytest.mark.parametrize("n, m", [(1, 5), (7, 7)])
+def test_main_writes_one_file_per_world(tmp_path, capsys, n, m):
+    assert main(["-n", str(n), "-m", str(m), "--worlds", "2", "--rounds", "500", "--stride", "10",
+                 "--output", str(tmp_path), "--compress"]) == 0
+    assert len(capsys.readouterr().out.splitlines()) == 2
+
+    data = np.load(tmp_path / "world_000001.npz")
+    assert (int(data["n"]), int(data["m"])) == (n, m)
+    assert data["types"].dtype == np.int8
+    assert len(data["hider_score"]) == 50
+    if "matrix" in data:
+        matrix = data["matrix"]
+    else:
+        from scipy.sparse import csr_array
+        correction = csr_array((data["correction_data"], data["correction_indices"], data["correction_indptr"]),
+                               shape=(n * m, n * m))
+        matrix = data["base"][:, None] + correction.toarray()
+    assert np.array_equal(matrix, build_matrix(data["types"], n, m))
+    assert np.min(data["hider"] @ matrix) == pytest.approx(float(data["game_value"]))
+
+
+def test_main_is_reproducible_and_takes_a_solver(tmp_path):
+    for name in ("a", "b"):
+        main(["-n", "2", "-m", "2", "--rounds", "100", "--seed", "3", "--solver", "rm_plus",
+              "--output", str(tmp_path / name)])
+    a = np.load(tmp_path / "a" / "world_000000.npz")
+    b = np.load(tmp_path / "b" / "world_000000.npz")
+    for key in a.files:
+        assert np.array_equal(a[key], b[key])
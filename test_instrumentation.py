@@ -0,0 +1,72 @@
+import json
+
+import numpy as np
+import pytest
+
+import Instrumentation
+from GameInterface import GameInterface
+from PayoffMatrix import PayoffMatrix
+
+
+@pytest.fixture
+def tracing():
+    Instrumentation.reset()
+    Instrumentation.enable(memory=True)
+    yield
+    Instrumentation.disable()
+    Instrumentation.reset()
+
+
+def test_disabled_records_nothing():
+    Instrumentation.reset()
+    with Instrumentation.span("idle", a=1) as s:
+        s.set(b=2)
+    Instrumentation.count("idle")
+    Instrumentation.snapshot("idle")
+    assert Instrumentation.report() == {"spans": [], "counters": {}, "snapshots": []}
+
+
+def test_pipeline_is_instrumented(tracing):
+    payoff = PayoffMatrix(3, 3, sparse=False, reduce=False, cache=None)
+    GameInterface(payoff, 0).simulate(1000, np.random.default_rng(0))
+
+    data = Instrumentation.report()
+    names = [s["name"] for s in data["spans"]]
+    for name in ["PayoffMatrix build", "PayoffMatrix solve", "LP setup", "linprog", "simulate chunk"]:
+        assert name in names
+    linprog = next(s for s in data["spans"] if s["name"] == "linprog")
+    assert linprog["args"]["status"] == 0
+    assert data["counters"]["linprog.calls"] == 1
+    assert data["counters"]["linprog.iterations"] == linprog["args"]["nit"]
+    assert data["counters"]["simulate.rounds"] == 1000
+    assert [s["label"] for s in data["snapshots"]] == ["matrix built", "game solved"]
+
+
+def test_exports(tracing, tmp_path):
+    with Instrumentation.span("outer", value=np.float64(1.5)):
+        with Instrumentation.span("inner"):
+            pass
+    Instrumentation.count("things", 3)
+    Instrumentation.snapshot("done")
+
+    Instrumentation.export_json(tmp_path / "report.json")
+    Instrumentation.export_chrome_trace(tmp_path / "trace.json")
+    report = json.loads((tmp_path / "report.json").read_text())
+    trace = json.loads((tmp_path / "trace.json").read_text())
+
+    assert [s["name"] for s in report["spans"]] == ["inner", "outer"]
+    outer, inner = report["spans"][1], report["spans"][0]
+    assert outer["start"] <= inner["start"] and inner["duration"] <= outer["duration"]
+    assert {e["ph"] for e in trace["traceEvents"]} == {"X", "C"}
+    assert trace["traceEvents"][1]["args"] == {"value": 1.5}
+    assert trace["otherData"]["counters"] == {"things": 3}
+
+
+def test_profiled_dumps_stats(tmp_path):
+    import pstats
+
+    path = tmp_path / "cycle.prof"
+    with Instrumentation.profiled(str(path)):
+        PayoffMatrix(2, 2, cache=None)
+    stats = pstats.Stats(str(path))
+    assert any(func[2] == "initialize" for func in stats.stats)
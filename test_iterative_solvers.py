@@ -0,0 +1,58 @@
+import numpy as np
+import pytest
+
+from IterativeSolvers import SOLVERS
+from PayoffMatrix import build_matrix
+from StrategyFinder import solve_zero_sum_game
+
+
+def fixed_world(n: int, m: int, seed: int = 0) -> np.ndarray:
+    location_type = np.random.default_rng(seed).integers(1, 4, n * m)
+    return build_matrix(location_type, n, m)
+
+
+def exploitability(matrix: np.ndarray, x: np.ndarray, y: np.ndarray) -> float:
+    return (matrix @ y).max() - (x @ matrix).min()
+
+
+@pytest.mark.parametrize("method", ["hedge", "rm_plus"])
+@pytest.mark.parametrize("n, m", [(2, 2), (1, 8), (3, 3)])
+def test_reaches_tolerance(method, n, m):
+    matrix = fixed_world(n, m)
+    value = solve_zero_sum_game(matrix)['Game value (v)']
+    result = solve_zero_sum_game(matrix, method, tol=1e-3)
+
+    assert result['Exploitability'] <= 1e-3
+    assert exploitability(matrix, result['Hider'], result['Seeker']) == pytest.approx(result['Exploitability'])
+    assert abs(result['Game value (v)'] - value) <= 1e-3
+
+
+def test_fictitious_play_converges():
+    matrix = fixed_world(2, 2)
+    value = solve_zero_sum_game(matrix)['Game value (v)']
+    result = solve_zero_sum_game(matrix, "fictitious_play", tol=5e-2)
+
+    assert result['Exploitability'] <= 5e-2
+    assert abs(result['Game value (v)'] - value) <= 5e-2
+
+
+@pytest.mark.parametrize("method", sorted(SOLVERS))
+def test_warns_when_max_iter_reached(method):
+    matrix = fixed_world(3, 3)
+    with pytest.warns(RuntimeWarning):
+        result = solve_zero_sum_game(matrix, method, tol=1e-9, max_iter=5)
+    assert result['Iterations'] == 5
+
+
+def test_callback_reports_every_iteration():
+    reports = []
+    result = solve_zero_sum_game(fixed_world(2, 2), "rm_plus", callback=lambda t, e: reports.append((t, e)))
+    assert [t for t, _ in reports] == list(range(1, result['Iterations'] + 1))
+    assert reports[-1][1] == result['Exploitability']
+
+
+def test_rejects_bad_method_and_options():
+    with pytest.raises(ValueError):
+        solve_zero_sum_game(fixed_world(1, 3), "simplex")
+    with pytest.raises(TypeError):
+        solve_zero_sum_game(fixed_world(1, 3), "dual", tol=1e-3)
@@ -0,0 +1,174 @@
+import asyncio
+import json
+
+import pytest
+
+from LoadTest import load_test
+import MatchServer as match_server
+from MatchServer import HISTORY, MatchServer, Session
+
+
+async def start(server: MatchServer):
+    tcp = await server.serve("127.0.0.1", 0)
+    reader, writer = await asyncio.open_connection("127.0.0.1", tcp.sockets[0].getsockname()[1])
+
+    async def ask(raw: bytes | None = None, **message):
+        writer.write((raw or json.dumps(message).encode()) + b"\n")
+        await writer.drain()
+        return json.loads(await reader.readline())
+
+    return tcp, writer, ask
+
+
+def test_protocol_round_trip():
+    async def scenario():
+        server = MatchServer(seed=0)
+        tcp, writer, ask = await start(server)
+        hider = await ask(op="new", n=2, m=3, seed=1, role="hider")
+        seeker = await ask(op="new", n=2, m=3, seed=1, role="seeker")
+        world = server.sessions[hider["session"]].world
+        assert server.sessions[seeker["session"]].world is world
+        assert hider["types"] == world.types and hider["value"] == pytest.approx(world.payoff.probability['Game value (v)'])
+
+        score = 0.0
+        for place in [0, 5, 3]:
+            reply = await ask(op="play", session=hider["session"], place=place)
+            score += world.matrix[place, reply["computer"]]
+            assert reply["player_score"] == pytest.approx(score)
+            assert reply["computer_score"] == pytest.approx(-score)
+        reply = await ask(op="play", session=seeker["session"], place=4)
+        assert reply["player_score"] == pytest.approx(-world.matrix[reply["computer"], 4])
+
+        history = await ask(op="history", session=hider["session"])
+        assert [h[0] for h in history["history"]] == [0, 5, 3]
+        assert "error" in await ask(op="play", session=hider["session"], place=6)
+        assert "error" in await ask(op="new", role="spectator")
+        assert "error" in await ask(op="fly", session=hider["session"])
+        assert (await ask(op="close", session=hider["session"]))["closed"]
+        assert "error" in await ask(op="play", session=hider["session"], place=0)
+
+        writer.close()
+        tcp.close()
+        await tcp.wait_closed()
+
+    asyncio.run(scenario())
+
+
+def test_plays_are_sampled_in_batches():
+    async def scenario():
+        server = MatchServer(seed=0)
+        flushes = []
+        flush = server.flush
+        server.flush = lambda: (flushes.append(len(server.batch)), flush())
+        world = await server.world(3, 3, 0)
+        sessions = [Session(i, world, i % 2) for i in range(500)]
+        replies = await asyncio.gather(*(server.play(s, i % 9) for i, s in enumerate(sessions)))
+        assert flushes == [500]
+        assert [r["session"] for r in replies] == list(range(500))
+        assert server.rounds == 500
+
+    asyncio.run(scenario())
+
+
+def test_history_is_a_ring_buffer():
+    async def scenario():
+        server = MatchServer(seed=0)
+        session = Session(1, await server.world(1, 4, 0), 0)
+        for i in range(HISTORY + 10):
+            await server.play(session, i % 4)
+        recent = session.recent()
+        assert len(recent) == HISTORY
+        assert [h[0] for h in recent] == [i % 4 for i in range(10, HISTORY + 10)]
+
+    asyncio.run(scenario())
+
+
+def test_worlds_are_shared_and_read_only():
+    async def scenario():
+        server = MatchServer()
+        first, second = await asyncio.gather(server.world(2, 2, 5), server.world(2, 2, 5))
+        assert first is second
+        with pytest.raises(ValueError):
+            first.matrix[0, 0] = 0
+        with pytest.raises(ValueError):
+            first.cdf[0][0] = 0
+
+    asyncio.run(scenario())
+
+
+def test_bad_requests_get_errors_and_keep_the_connection():
+    async def scenario():
+        server = MatchServer(seed=0)
+        tcp, writer, ask = await start(server)
+        for line in [b"[1, 2]", b"{not json", b'"new"', b"{}"]:
+            assert "error" in await ask(raw=line)
+        assert "at most" in (await ask(op="new", n=100, m=100))["error"]
+        assert "session" in await ask(op="new", n=2, m=2, seed=0)
+
+        writer.close()
+        tcp.close()
+        await tcp.wait_closed()
+
+    asyncio.run(scenario())
+
+
+def test_failed_solve_is_answered_and_not_cached(monkeypatch):
+    async def scenario():
+        server = MatchServer(seed=0)
+        tcp, writer, ask = await start(server)
+
+        def fail(*args, **kwargs):
+            raise RuntimeError("linprog failed")
+
+        with monkeypatch.context() as patch:
+            patch.setattr(match_server, "PayoffMatrix", fail)
+            assert (await ask(op="new", n=2, m=2, seed=0))["error"] == "linprog failed"
+        assert not server.worlds
+        assert "session" in await ask(op="new", n=2, m=2, seed=0)
+
+        writer.close()
+        tcp.close()
+        await tcp.wait_closed()
+
+    asyncio.run(scenario())
+
+
+def test_disconnect_closes_sessions_and_idle_worlds_are_evicted(monkeypatch):
+    monkeypatch.setattr(match_server, "MAX_WORLDS", 1)
+
+    async def scenario():
+        server = MatchServer(seed=0)
+        tcp, writer, ask = await start(server)
+        first = await ask(op="new", n=2, m=2, seed=0)
+        second = await ask(op="new", n=2, m=2, seed=1)
+        # both worlds are in use, so neither is evicted
+        assert list(server.worlds) == [(2, 2, 0), (2, 2, 1)]
+        world = server.sessions[first["session"]].world
+
+        await ask(op="close", session=first["session"])
+        assert world.sessions == 0
+        assert list(server.worlds) == [(2, 2, 1)]
+
+        writer.close()
+        while server.sessions:
+            await asyncio.sleep(0.01)
+        assert second["session"] not in server.sessions
+        assert list(server.worlds) == [(2, 2, 1)]
+        tcp.close()
+        await tcp.wait_closed()
+
+    asyncio.run(scenario())
+
+
+def test_load_test_plays_every_round():
+    async def scenario():
+        tcp = await MatchServer().serve("127.0.0.1", 0)
+        port = tcp.sockets[0].getsockname()[1]
+        result = await load_test("127.0.0.1", port, clients=4, sessions=3, rounds=20, pipeline=8, n=2, m=2)
+        tcp.close()
+        await tcp.wait_closed()
+        return result
+
+    result = asyncio.run(scenario())
+    assert result["rounds"] == 4 * 3 * 20
+    assert result["rounds_per_second"] > 0
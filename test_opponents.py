@@ -0,0 +1,97 @@
+import numpy as np
+import pytest
+
+from GameInterface import GameInterface
+from Opponents import FenwickTree, MaxTree, make_opponent
+from PayoffMatrix import PayoffMatrix, build_matrix, build_structured
+
+
+def world(n: int = 4, m: int = 5, seed: int = 0):
+    location_type = np.random.default_rng(seed).integers(1, 4, n * m)
+    return build_matrix(location_type, n, m), build_structured(location_type, n, m)
+
+
+def test_fenwick_find_and_add():
+    tree = FenwickTree([1.0, 0.0, 2.0, 3.0, 0.5])
+    assert [tree.find(u) for u in (0.0, 0.99, 1.0, 2.99, 3.0, 5.99, 6.0, 6.49)] == [0, 0, 2, 2, 3, 3, 4, 4]
+    tree.add(1, 4.0)
+    assert tree.total == pytest.approx(10.5)
+    assert tree.find(1.0) == 1
+    assert tree.find(5.0) == 2
+
+
+def test_max_tree_tracks_argmax():
+    values = np.random.default_rng(0).normal(size=13)
+    tree = MaxTree(values.tolist())
+    for i, delta in [(3, 5.0), (12, 7.0), (3, -9.0), (0, 0.5)]:
+        values[i] += delta
+        tree.add(i, delta)
+        value, index = tree.top()
+        assert index == np.argmax(values)
+        assert value == pytest.approx(values.max())
+
+
+@pytest.mark.parametrize("computer_is_hider", [False, True])
+def test_frequency_opponent_best_responds_to_counts(computer_is_hider):
+    dense, structured = world()
+    rng = np.random.default_rng(1)
+    opponent = make_opponent("frequency", structured, np.full(20, 1 / 20), computer_is_hider, rng)
+    counts = np.zeros(20)
+    for player in rng.integers(0, 20, 200):
+        opponent.observe(int(player), 0)
+        counts[player] += 1
+        # expected payoff of every computer move against the player's frequencies
+        utility = dense @ counts if computer_is_hider else -(counts @ dense)
+        assert utility[opponent.choose()] == pytest.approx(utility.max())
+
+
+def test_markov_opponent_predicts_a_cycle():
+    dense, structured = world()
+    opponent = make_opponent("markov", structured, np.full(20, 1 / 20), False, np.random.default_rng(0), window=10)
+    cycle = [3, 7, 11]
+    for t in range(30):
+        opponent.observe(cycle[t % 3], 0)
+    # the seeker's best response to a known hiding place is to search it
+    assert opponent.choose() == np.argmin(dense[cycle[0]])
+
+
+def test_markov_window_forgets_old_transitions():
+    _, structured = world()
+    opponent = make_opponent("markov", structured, np.full(20, 1 / 20), False, np.random.default_rng(0), window=4)
+    for player in [1, 2, 1, 2, 1, 2, 1, 5, 1, 5, 1]:
+        opponent.observe(player, 0)
+    assert opponent.top[1] == 2
+    assert opponent.choose() == opponent.best_response(5)
+
+
+def test_exp3_learns_against_a_fixed_player():
+    dense, structured = world()
+    opponent = make_opponent("exp3", structured, np.full(20, 1 / 20), False, np.random.default_rng(2))
+    for _ in range(3000):
+        opponent.observe(6, opponent.choose())
+    assert np.argmax(opponent.weights) == np.argmin(dense[6])
+
+
+def test_equilibrium_opponent_samples_the_strategy():
+    _, structured = world()
+    strategy = np.random.default_rng(3).dirichlet(np.ones(20))
+    opponent = make_opponent("equilibrium", structured, strategy, True, np.random.default_rng(4))
+    counts = np.bincount([opponent.choose() for _ in range(20000)], minlength=20)
+    assert np.allclose(counts / 20000, strategy, atol=0.02)
+
+
+def test_unknown_opponent():
+    _, structured = world()
+    with pytest.raises(ValueError):
+        make_opponent("psychic", structured, np.full(20, 1 / 20), True)
+
+
+@pytest.mark.parametrize("opponent", ["equilibrium", "frequency", "exp3", "markov"])
+@pytest.mark.parametrize("perspective", [0, 1])
+def test_game_with_every_opponent(opponent, perspective, capsys):
+    interface = GameInterface(PayoffMatrix(3, 3, cache=None), perspective, opponent, np.random.default_rng(5))
+    for place in [0, 4, 8, 4, 0]:
+        interface.game(place)
+    assert interface.player_choices == [0, 4, 8, 4, 0]
+    assert len(interface.computer_choices) == 5
+    assert capsys.readouterr().out == ""
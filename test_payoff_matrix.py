@@ -0,0 +1,160 @@
+import numpy as np
+import pytest
+
+from Benchmark import build_matrix_loop
+from PayoffMatrix import PayoffMatrix, build_block, build_matrix, build_structured
+from StrategyFinder import solve_zero_sum_game
+
+WORLDS = [(1, 1), (1, 2), (1, 8), (2, 2), (3, 3), (2, 5), (4, 7), (6, 6)]
+
+
+def location_types(n: int, m: int, seed: int = 0) -> np.ndarray:
+    return np.random.default_rng(seed).integers(1, 4, n * m)
+
+
+@pytest.mark.parametrize("n, m", WORLDS)
+def test_vectorized_builder_matches_loop(n, m):
+    location_type = location_types(n, m)
+    assert np.array_equal(build_matrix(location_type, n, m),
+                          np.asarray(build_matrix_loop(location_type, n, m)))
+
+
+@pytest.mark.parametrize("n, m", WORLDS)
+def test_structured_matches_dense(n, m):
+    location_type = location_types(n, m)
+    dense = build_matrix(location_type, n, m)
+    structured = build_structured(location_type, n, m)
+
+    assert np.array_equal(structured.toarray(), dense)
+    y = np.random.default_rng(1).random(n * m)
+    assert np.allclose(structured @ y, dense @ y)
+    assert np.allclose(y @ structured, y @ dense)
+
+
+@pytest.mark.parametrize("n, m", WORLDS)
+def test_structured_lp_matches_dense_lp(n, m):
+    location_type = location_types(n, m)
+    dense = solve_zero_sum_game(build_matrix(location_type, n, m))
+    structured = solve_zero_sum_game(build_structured(location_type, n, m))
+    assert structured['Game value (v)'] == pytest.approx(dense['Game value (v)'])
+
+
+@pytest.mark.parametrize("key", [
+    0, -1, slice(0, 2), slice(None, None, -3), np.array([3, 0]),
+    (1, 2), (-1, -2), (np.array([0, 4]), np.array([4, 0])),
+    (slice(1, 4), 2), (3, slice(None)), (slice(0, 3), slice(2, 5)), (slice(0, 2), np.array([1, 3])),
+])
+def test_structured_indexing_matches_ndarray(key):
+    location_type = location_types(2, 3)
+    dense = build_matrix(location_type, 2, 3)
+    structured = build_structured(location_type, 2, 3)
+    assert np.array_equal(structured[key], dense[key])
+
+
+def test_structured_index_out_of_bounds():
+    structured = build_structured(location_types(1, 4), 1, 4)
+    with pytest.raises(IndexError):
+        structured[4]
+    with pytest.raises(IndexError):
+        structured[0, -5]
+
+
+def test_block_matches_full_matrix():
+    location_type = location_types(5, 6)
+    dense = build_matrix(location_type, 5, 6)
+    rows, cols = np.array([0, 7, 29]), np.array([1, 3, 7, 13, 28])
+    assert np.array_equal(build_block(location_type, 5, 6, rows, cols), dense[np.ix_(rows, cols)])
+
+
+@pytest.mark.parametrize("sparse", [False, True])
+def test_set_location_type_rebuilds_and_resolves(sparse):
+    game = PayoffMatrix(4, 5, sparse=sparse, rng=np.random.default_rng(2), cache=None)
+    game.set_location_type(7, game.location_type[7] % 3 + 1)
+
+    assert np.array_equal(np.asarray(game.matrix[:]), build_matrix(game.location_type, 4, 5))
+    cold = solve_zero_sum_game(build_matrix(game.location_type, 4, 5))
+    assert game.probability['Game value (v)'] == pytest.approx(cold['Game value (v)'])
+
+
+@pytest.mark.parametrize("sparse", [False, True])
+@pytest.mark.parametrize("n, m", [(5, 4), (3, 6), (2, 2)])
+def test_resize_keeps_types_and_resolves(sparse, n, m):
+    game = PayoffMatrix(3, 4, sparse=sparse, rng=np.random.default_rng(3), cache=None)
+    old_types = list(game.location_type)
+    game.resize(n, m)
+
+    for r in range(min(n, 3)):
+        for c in range(min(m, 4)):
+            assert game.location_type[r * m + c] == old_types[r * 4 + c]
+    assert np.array_equal(np.asarray(game.matrix[:]), build_matrix(game.location_type, n, m))
+    cold = solve_zero_sum_game(build_matrix(game.location_type, n, m))
+    assert game.probability['Game value (v)'] == pytest.approx(cold['Game value (v)'])
+
+
+@pytest.mark.parametrize("sparse", [False, True])
+def test_resize_without_resolve_leaves_world_unsolved(sparse):
+    game = PayoffMatrix(3, 4, sparse=sparse, rng=np.random.default_rng(4), cache=None)
+    game.resize(2, 2, resolve=False)
+    assert game.probability is None
+    game.resize(3, 3)
+
+    cold = solve_zero_sum_game(build_matrix(game.location_type, 3, 3))
+    assert game.probability['Game value (v)'] == pytest.approx(cold['Game value (v)'])
+    assert game.probability['Hider'].sum() == pytest.approx(1)
+
+
+def test_set_location_type_updates_structured_row_in_place():
+    game = PayoffMatrix(4, 5, sparse=True, rng=np.random.default_rng(8), cache=None)
+    matrix = game.matrix
+    for ind in (0, 7, 19):
+        game.set_location_type(ind, game.location_type[ind] % 3 + 1, resolve=False)
+    assert game.matrix is matrix
+
+    expected = build_matrix(game.location_type, 4, 5)
+    x = np.random.default_rng(0).random(20)
+    assert np.allclose(x @ game.matrix, x @ expected)
+    assert np.allclose(game.matrix @ x, expected @ x)
+
+
+@pytest.mark.parametrize("sparse", [False, True])
+def test_save_load_round_trip(tmp_path, sparse):
+    game = PayoffMatrix(3, 4, sparse=sparse, rng=np.random.default_rng(5), cache=None)
+    game.save(tmp_path / "world")
+    loaded = PayoffMatrix.load(tmp_path / "world", n=3, m=4, one_d=False)
+
+    assert loaded.location_type == game.location_type
+    assert np.array_equal(np.asarray(loaded.matrix[:]), np.asarray(game.matrix[:]))
+    assert np.array_equal(loaded.probability['Hider'], game.probability['Hider'])
+    assert np.array_equal(loaded.probability['Seeker'], game.probability['Seeker'])
+    assert loaded.probability['Game value (v)'] == game.probability['Game value (v)']
+    if not sparse:
+        assert isinstance(loaded.matrix, np.memmap)
+
+
+def test_load_copy_on_write_leaves_file_alone(tmp_path):
+    game = PayoffMatrix(1, 6, sparse=False, rng=np.random.default_rng(6), cache=None)
+    game.save(tmp_path)
+    loaded = PayoffMatrix.load(tmp_path, one_d=True, mmap_mode="c", cache=None)
+    loaded.set_location_type(2, loaded.location_type[2] % 3 + 1)
+    assert np.array_equal(loaded.matrix, build_matrix(loaded.location_type, 1, 6))
+    assert np.array_equal(PayoffMatrix.load(tmp_path).matrix, game.matrix)
+
+
+def test_load_rejects_wrong_dimensions_and_corruption(tmp_path, monkeypatch):
+    PayoffMatrix(2, 3, sparse=False, rng=np.random.default_rng(7), cache=None).save(tmp_path)
+    with pytest.raises(ValueError, match="n=2"):
+        PayoffMatrix.load(tmp_path, n=3)
+    with pytest.raises(ValueError, match="one_d"):
+        PayoffMatrix.load(tmp_path, one_d=True)
+
+    monkeypatch.setattr("PayoffMatrix.SOLVER_VERSION", 2)
+    with pytest.raises(ValueError, match="solver version"):
+        PayoffMatrix.load(tmp_path)
+    monkeypatch.undo()
+
+    with open(tmp_path / "matrix.npy", "r+b") as f:
+        f.seek(-8, 2)
+        f.write(np.float64(42).tobytes())
+    with pytest.raises(ValueError, match="checksum"):
+        PayoffMatrix.load(tmp_path)
+    assert PayoffMatrix.load(tmp_path, verify=False).matrix[-1, -1] == 42
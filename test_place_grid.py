@@ -0,0 +1,53 @@
+import pytest
+from PyQt6.QtCore import QPoint, Qt
+from PyQt6.QtTest import QTest
+
+from PlaceGrid import DIFFERENT_COLORS, SAME_COLORS, PlaceGrid
+
+
+@pytest.fixture
+def grid(app):
+    grid = PlaceGrid()
+    grid.resize(300, 200)
+    grid.set_world(2, 3, [1, 2, 3, 1, 2, 3])
+    grid.show()
+    app.processEvents()
+    return grid
+
+
+def test_hit_testing(grid):
+    size = grid.cell_size()
+    assert size == min(300 // 3, 200 // 2)
+    assert grid.index_at(0, 0) == 0
+    assert grid.index_at(2 * size + 1, size + 1) == 5
+    assert grid.index_at(3 * size + 1, 0) is None
+
+
+def test_click_emits_place(grid):
+    clicked = []
+    grid.place_clicked.connect(clicked.append)
+    size = grid.cell_size()
+    QTest.mouseClick(grid, Qt.MouseButton.LeftButton, pos=QPoint(size + size // 2, size + size // 2))
+    assert clicked == [4]
+
+    grid.setEnabled(False)
+    QTest.mouseClick(grid, Qt.MouseButton.LeftButton, pos=QPoint(1, 1))
+    assert clicked == [4]
+
+
+def test_highlight_semantics(grid):
+    grid.highlight(1, 4)
+    assert grid.highlighted == {1: DIFFERENT_COLORS, 4: DIFFERENT_COLORS}
+    grid.highlight(2, 2)
+    assert grid.highlighted == {2: SAME_COLORS}
+    grid.clear_highlight()
+    assert grid.highlighted == {}
+
+
+def test_paints_type_and_highlight_colours(grid):
+    grid.highlight(0, 0)
+    image = grid.grab().toImage()
+    size = grid.cell_size()
+    # sample near the corner of each cell, away from the index label
+    assert image.pixelColor(5, 5).name() == "#000000"
+    assert image.pixelColor(size + 5, 5).name() == "#008000"
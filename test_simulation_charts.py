@@ -0,0 +1,35 @@
+import numpy as np
+
+from SimulationCharts import FrequencyBars, ScoreChart
+
+
+def test_score_chart_stays_bounded(app):
+    chart = ScoreChart()
+    for chunk in range(1000):
+        rounds = chunk * 100 + np.arange(1, 17)
+        chart.add_points(rounds, rounds * 2.0, -rounds * 1.0)
+    assert chart.count <= ScoreChart.MAX_POINTS
+    # the latest point is always kept and rounds stay ordered
+    assert chart.points[chart.count - 1, 0] == 999 * 100 + 16
+    assert np.all(np.diff(chart.points[:chart.count, 0]) > 0)
+    chart.grab()
+
+
+def test_frequency_bars_count_choices(app):
+    bars = FrequencyBars()
+    bars.set_equilibrium([0.5, 0.5, 0.0], [0.25, 0.25, 0.5])
+    bars.add_choices(np.array([0, 1, 1]), np.array([2, 2, 0]))
+    bars.add_choices(np.array([0]), np.array([1]))
+    assert bars.counts.tolist() == [[2, 2, 0], [1, 1, 2]]
+    bars.grab()
+
+
+def test_score_chart_first_batch_larger_than_buffer(app):
+    chart = ScoreChart()
+    rounds = np.arange(1, 3001)
+    chart.add_points(rounds, rounds * 2.0, -rounds * 1.0)
+    assert 0 < chart.count <= ScoreChart.MAX_POINTS
+    # only real points are kept, the empty buffer is not decimated into them
+    assert chart.points[0, 0] >= 1
+    assert chart.points[chart.count - 1, 0] == 3000
+    assert np.all(np.diff(chart.points[:chart.count, 0]) > 0)
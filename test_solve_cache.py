@@ -0,0 +1,76 @@
+import os
+import time
+
+import numpy as np
+import pytest
+
+from PayoffMatrix import PayoffMatrix, build_matrix, build_structured
+from SolveCache import EquilibriumCache, cache_key
+from StrategyFinder import solve_zero_sum_game
+
+
+def world(seed: int, n: int = 2, m: int = 3) -> np.ndarray:
+    return build_matrix(np.random.default_rng(seed).integers(1, 4, n * m), n, m)
+
+
+def test_key_depends_on_content_and_params():
+    assert cache_key(world(0)) == cache_key(world(0).copy())
+    assert cache_key(world(0)) != cache_key(world(1))
+    assert cache_key(world(0), method="dual") != cache_key(world(0), method="rm_plus")
+
+    types = np.random.default_rng(0).integers(1, 4, 6)
+    assert cache_key(build_structured(types, 2, 3)) == cache_key(build_structured(types, 2, 3))
+
+
+def test_memory_lru_and_counters():
+    cache = EquilibriumCache(max_entries=2)
+    keys = [cache_key(world(seed)) for seed in range(3)]
+    for seed, key in enumerate(keys):
+        assert cache.get(key) is None
+        cache.put(key, solve_zero_sum_game(world(seed)))
+    assert len(cache) == 2
+    assert cache.get(keys[0]) is None
+    assert cache.get(keys[2]) is not None
+    assert cache.stats() == {"hits": 1, "disk_hits": 0, "misses": 4, "entries": 2}
+
+
+def test_returned_results_are_copies():
+    cache = EquilibriumCache()
+    key = cache_key(world(0))
+    cache.put(key, solve_zero_sum_game(world(0)))
+    cache.get(key)['Hider'][:] = -1
+    assert np.all(cache.get(key)['Hider'] >= 0)
+
+
+def test_disk_tier_survives_new_instance(tmp_path):
+    key = cache_key(world(0))
+    result = solve_zero_sum_game(world(0))
+    EquilibriumCache(directory=str(tmp_path)).put(key, result)
+
+    fresh = EquilibriumCache(directory=str(tmp_path))
+    loaded = fresh.get(key)
+    assert fresh.disk_hits == 1
+    assert np.array_equal(loaded['Hider'], result['Hider'])
+    assert loaded['Game value (v)'] == result['Game value (v)']
+
+
+def test_disk_tier_evicts_least_recently_used(tmp_path):
+    cache = EquilibriumCache(directory=str(tmp_path))
+    keys = [cache_key(world(seed)) for seed in range(3)]
+    for seed, key in enumerate(keys):
+        cache.put(key, solve_zero_sum_game(world(seed)))
+        os.utime(tmp_path / f"{key}.npz", (time.time() + seed, time.time() + seed))
+    size = os.path.getsize(tmp_path / f"{keys[0]}.npz")
+
+    cache.max_disk_bytes = 2 * size + size // 2
+    cache._evict_disk()
+    assert sorted(os.listdir(tmp_path)) == sorted(f"{key}.npz" for key in keys[1:])
+
+
+def test_payoff_matrix_reuses_cached_equilibrium():
+    cache = EquilibriumCache()
+    first = PayoffMatrix(3, 3, rng=np.random.default_rng(5), cache=cache)
+    second = PayoffMatrix(3, 3, rng=np.random.default_rng(5), cache=cache)
+    assert cache.hits == 1
+    assert cache.misses == 1
+    assert second.probability['Game value (v)'] == pytest.approx(first.probability['Game value (v)'])
@@ -0,0 +1,47 @@
+import re
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).parent
+
+# cumulative import time budgets in seconds, well above what a cold start
+# costs today (about 0.2 s for GameInterface and 0.25 s for Gui, mostly
+# numpy and PyQt6) but far below importing scipy.optimize as well
+BUDGETS = {"GameInterface": 0.5, "Gui": 0.8}
+
+
+def import_times(module: str) -> dict:
+    """
+    run `python -X importtime -c "import module"` in a fresh interpreter
+
+    :return: cumulative import time in seconds of every imported module
+    """
+    output = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=ROOT, capture_output=True, text=True, check=True,
+    ).stderr
+    times = {}
+    for line in output.splitlines():
+        match = re.match(r"import time:\s+\d+ \|\s+(\d+) \| ( *)(\S+)", line)
+        if match:
+            times[match.group(3)] = int(match.group(1)) / 1e6
+    return times
+
+
+@pytest.mark.parametrize("module", sorted(BUDGETS))
+def test_import_stays_within_budget(module):
+    if module == "Gui":
+        pytest.importorskip("PyQt6")
+    times = import_times(module)
+
+    assert not any(name.split(".")[0] == "scipy" for name in times), "scipy should only load on the first solve"
+    assert times[module] < BUDGETS[module], f"importing {module} took {times[module]:.3f}s"
+
+
+def test_import_has_no_output():
+    result = subprocess.run([sys.executable, "-c", "import GameInterface"],
+                            cwd=ROOT, capture_output=True, text=True, check=True)
+    assert result.stdout == ""
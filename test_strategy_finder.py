@@ -0,0 +1,41 @@
+import numpy as np
+import pytest
+from scipy.optimize import OptimizeResult
+
+from PayoffMatrix import build_matrix, build_structured
+from StrategyFinder import solve_warm, solve_zero_sum_game
+
+
+@pytest.mark.parametrize("seed", range(5))
+@pytest.mark.parametrize("builder", [build_matrix, build_structured])
+def test_dual_matches_two_lp(seed, builder):
+    location_type = np.random.default_rng(seed).integers(1, 4, 12)
+    matrix = builder(location_type, 3, 4)
+    dual = solve_zero_sum_game(matrix, "dual")
+    two_lp = solve_zero_sum_game(matrix, "two_lp")
+
+    v = dual['Game value (v)']
+    assert v == pytest.approx(two_lp['Game value (v)'])
+    dense = build_matrix(location_type, 3, 4)
+    assert (dense @ dual['Seeker']).max() == pytest.approx(v)
+    assert (dual['Hider'] @ dense).min() == pytest.approx(v)
+
+
+def test_failed_solve_raises(monkeypatch):
+    failed = OptimizeResult(success=False, status=2, message="The problem is infeasible.", x=None)
+    monkeypatch.setattr("scipy.optimize.linprog", lambda *args, **kwargs: failed)
+    with pytest.raises(RuntimeError, match="infeasible"):
+        solve_zero_sum_game([[1, 2], [3, 4]])
+
+
+@pytest.mark.parametrize("builder", [build_matrix, build_structured])
+@pytest.mark.parametrize("support", [[0], [3, 8, 12]])
+def test_warm_start_matches_cold_solve(builder, support):
+    location_type = np.random.default_rng(4).integers(1, 4, 30)
+    matrix = builder(location_type, 5, 6)
+    cold = solve_zero_sum_game(matrix)
+    warm = solve_warm(matrix, support, support)
+
+    assert warm['Game value (v)'] == pytest.approx(cold['Game value (v)'])
+    assert np.min(warm['Hider'] @ matrix) == pytest.approx(cold['Game value (v)'])
+    assert np.max(matrix @ warm['Seeker']) == pytest.approx(cold['Game value (v)'])
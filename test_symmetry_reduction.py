@@ -0,0 +1,55 @@
+import numpy as np
+import pytest
+
+from PayoffMatrix import build_matrix, build_structured
+from StrategyFinder import solve_zero_sum_game
+from SymmetryReduction import grid_symmetries, orbits, remove_dominated, solve_reduced
+
+
+def symmetric_types(n: int, m: int, seed: int = 0) -> np.ndarray:
+    types = np.random.default_rng(seed).integers(1, 4, (n, m))
+    types = np.maximum(types, types[::-1])
+    types = np.maximum(types, types[:, ::-1])
+    if n == m:
+        types = np.maximum(types, types.T)
+    return types.ravel()
+
+
+def test_square_world_with_one_type_has_full_dihedral_group():
+    symmetries = grid_symmetries(np.ones(16, dtype=int), 4, 4)
+    assert len(symmetries) == 8
+    # corners, edge cells next to corners and the centre block
+    assert orbits(symmetries).max() + 1 == 3
+
+
+def test_symmetries_leave_payoff_invariant():
+    types = symmetric_types(5, 5)
+    matrix = build_matrix(types, 5, 5)
+    for p in grid_symmetries(types, 5, 5):
+        assert np.array_equal(matrix[np.ix_(p, p)], matrix)
+
+
+@pytest.mark.parametrize("n, m", [(1, 7), (1, 8), (4, 4), (5, 5), (4, 6), (12, 12)])
+@pytest.mark.parametrize("builder", [build_matrix, build_structured])
+@pytest.mark.parametrize("symmetric", [True, False])
+def test_reduced_solution_is_full_equilibrium(n, m, builder, symmetric):
+    if symmetric:
+        types = symmetric_types(n, m)
+    else:
+        types = np.random.default_rng(1).integers(1, 4, n * m)
+    dense = build_matrix(types, n, m)
+    value = solve_zero_sum_game(dense)['Game value (v)']
+
+    result = solve_reduced(builder(types, n, m), types, n, m)
+    assert result['Game value (v)'] == pytest.approx(value)
+    assert result['Hider'].sum() == pytest.approx(1)
+    assert result['Seeker'].sum() == pytest.approx(1)
+    assert (dense @ result['Seeker']).max() == pytest.approx(value)
+    assert (result['Hider'] @ dense).min() == pytest.approx(value)
+
+
+def test_remove_dominated():
+    matrix = np.array([[3, 1], [0, 2], [-1, -1]], dtype=float)
+    reduced, rows, cols = remove_dominated(matrix)
+    assert list(rows) == [0, 1]
+    assert list(cols) == [0, 1]
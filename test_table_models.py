@@ -0,0 +1,50 @@
+import numpy as np
+import pytest
+from PyQt6.QtCore import Qt
+
+from PayoffMatrix import build_matrix, build_structured
+from TableModels import (
+    HIGH_COLOR, LOW_COLOR, ChoicesTableModel, PayoffTableModel, ProbabilityTableModel,
+)
+
+DISPLAY = Qt.ItemDataRole.DisplayRole
+BACKGROUND = Qt.ItemDataRole.BackgroundRole
+
+
+@pytest.mark.parametrize("builder", [build_matrix, build_structured])
+def test_payoff_model_reads_matrix(builder):
+    types = np.random.default_rng(0).integers(1, 4, 12)
+    dense = build_matrix(types, 3, 4)
+    model = PayoffTableModel(builder(types, 3, 4))
+
+    assert (model.rowCount(), model.columnCount()) == (12, 12)
+    assert (model.low, model.high) == (dense.min(), dense.max())
+    for i, j in [(0, 0), (0, 1), (5, 7), (11, 3)]:
+        assert float(model.data(model.index(i, j), DISPLAY)) == dense[i, j]
+
+
+def test_payoff_model_heatmap_spans_range():
+    model = PayoffTableModel(np.array([[-3.0, 2.0], [1.0, -1.0]]))
+    assert model.data(model.index(0, 0), BACKGROUND).getRgb()[:3] == LOW_COLOR
+    assert model.data(model.index(0, 1), BACKGROUND).getRgb()[:3] == HIGH_COLOR
+
+
+def test_probability_model():
+    model = ProbabilityTableModel({'Hider': np.array([0.25, 0.75]), 'Seeker': np.array([1.0, 0.0])})
+    assert (model.rowCount(), model.columnCount()) == (2, 2)
+    assert model.data(model.index(0, 1), DISPLAY) == "0.7500"
+    assert model.headerData(1, Qt.Orientation.Vertical) == "Seeker"
+
+
+def test_choices_model_appends_and_resets():
+    model = ChoicesTableModel()
+    for i in range(40):
+        model.append(i, 2 * i)
+    assert model.rowCount() == 40
+    assert model.data(model.index(39, 1), DISPLAY) == "78"
+
+    model.set_choices(np.array([1, 2]), np.array([3, 4]))
+    assert model.rowCount() == 2
+    assert model.data(model.index(1, 0), DISPLAY) == "2"
+    model.clear()
+    assert model.rowCount() == 0
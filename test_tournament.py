@@ -0,0 +1,27 @@
+import csv
+
+import pytest
+
+from Tournament import make_tasks, play_world, run_tournament
+
+
+def test_tasks_are_reproducible():
+    first = make_tasks(5, (1, 4), (1, 4), 100, seed=3)
+    second = make_tasks(5, (1, 4), (1, 4), 100, seed=3)
+    assert [t[:4] for t in first] == [t[:4] for t in second]
+    assert all(1 <= n <= 4 and 1 <= m <= 4 for _, n, m, _, _ in first)
+
+
+def test_run_tournament_matches_serial_play(tmp_path):
+    tasks = make_tasks(6, (1, 3), (1, 3), 200, seed=1)
+    output = tmp_path / "results.csv"
+    assert run_tournament(tasks, str(output), workers=2) == 6
+
+    with open(output, newline="") as f:
+        rows = {int(row["world"]): row for row in csv.DictReader(f)}
+    assert sorted(rows) == list(range(6))
+    for task in tasks:
+        expected = play_world(task)
+        row = rows[task[0]]
+        assert float(row["game_value"]) == pytest.approx(expected["game_value"])
+        assert float(row["hider_score"]) == pytest.approx(expected["hider_score"])